@@ -0,0 +1,189 @@
+"""
+Admission control for CPU-heavy analysis
+
+At most ADMISSION_MAX_CONCURRENT analyses (PDF extraction + scoring) run
+at once in a server process; up to ADMISSION_MAX_QUEUE more wait for a
+slot, each for at most ADMISSION_QUEUE_TIMEOUT seconds. Anything beyond
+that is turned away immediately with Overloaded, which the app answers
+with 503 and a Retry-After estimated from recent service times, so a
+spike degrades into fast rejections instead of every request slowing
+down together.
+
+Size and page-count limits (MAX_RESUME_BYTES, MAX_RESUME_PAGES) are
+checked by the routes before a request is admitted.
+
+admit() is for request threads (Flask); admit_async() is the same slot
+and queue for coroutines (asgi.py), with the wait parked on a thread of
+its own so the event loop never blocks. acquire() takes a slot for work
+that outlives the caller's block, such as a batch resume in the process
+pool, and hands back the function that releases it.
+
+Background jobs don't take slots: JobQueue bounds its own backlog
+(JOB_MAX_PENDING) and raises the same Overloaded when it is full.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+
+import metrics
+
+ADMISSION_MAX_CONCURRENT = int(os.environ.get("ADMISSION_MAX_CONCURRENT", os.cpu_count() or 1))
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", ADMISSION_MAX_CONCURRENT * 4))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 10.0))
+
+MAX_RESUME_BYTES = int(os.environ.get("MAX_RESUME_BYTES", 20 * 1024 * 1024))
+MAX_RESUME_PAGES = int(os.environ.get("MAX_RESUME_PAGES", 200))
+
+# Weight of the newest sample in the service-time moving average
+_SERVICE_TIME_SMOOTHING = 0.2
+
+
+class Overloaded(Exception):
+    """No analysis slot available; retry_after is a whole number of seconds"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Server busy ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limit plus a bounded, deadline-limited wait queue"""
+
+    def __init__(self, max_concurrent=None, max_queue=None, queue_timeout=None):
+        self.max_concurrent = max_concurrent or ADMISSION_MAX_CONCURRENT
+        self.max_queue = ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        self.queue_timeout = ADMISSION_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.service_seconds = None  # Moving average of time spent holding a slot
+        self._condition = threading.Condition()
+        self._waiter_pool = None
+
+    def retry_after(self):
+        """Seconds until a slot is likely free: queued work spread over the slots"""
+        service_seconds = self.service_seconds or 1.0
+        return max(math.ceil(service_seconds * (self.waiting + 1) / self.max_concurrent), 1)
+
+    def _try_acquire(self):
+        """Take a free slot without waiting (caller holds the lock); raises when the queue is full"""
+        if self.active < self.max_concurrent and not self.waiting:
+            self.active += 1
+            return True
+        if self.waiting >= self.max_queue:
+            raise Overloaded("queue_full", self.retry_after())
+        return False
+
+    def _acquire(self, timeout):
+        with self._condition:
+            if self._try_acquire():
+                return 0.0
+
+            started = time.monotonic()
+            deadline = started + timeout
+            self.waiting += 1
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # Pass on any wake-up this waiter may have consumed
+                        self._condition.notify()
+                        raise Overloaded("queue_timeout", self.retry_after())
+                    self._condition.wait(remaining)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+            return time.monotonic() - started
+
+    def _release(self, held_seconds):
+        with self._condition:
+            self.active -= 1
+            if held_seconds is None:
+                pass  # Slot returned unused; not a service time
+            elif self.service_seconds is None:
+                self.service_seconds = held_seconds
+            else:
+                self.service_seconds += _SERVICE_TIME_SMOOTHING * (held_seconds - self.service_seconds)
+            self._condition.notify()
+
+    def acquire(self, timeout=None):
+        """Take one analysis slot; returns the function that gives it back. Raises Overloaded"""
+        try:
+            waited = self._acquire(self.queue_timeout if timeout is None else timeout)
+        except Overloaded as exc:
+            metrics.admission_rejections.inc(reason=exc.reason)
+            raise
+        metrics.admission_wait_seconds.observe(waited)
+        started = time.perf_counter()
+        return lambda: self._release(time.perf_counter() - started)
+
+    def try_acquire(self):
+        """acquire() without waiting: None (not a rejection) when no slot is free right now"""
+        with self._condition:
+            if self.active >= self.max_concurrent or self.waiting:
+                return None
+            self.active += 1
+        started = time.perf_counter()
+        return lambda: self._release(time.perf_counter() - started)
+
+    @contextmanager
+    def admit(self, timeout=None):
+        """Hold one analysis slot for the with block; raises Overloaded"""
+        release = self.acquire(timeout)
+        try:
+            yield
+        finally:
+            release()
+
+    @asynccontextmanager
+    async def admit_async(self, timeout=None):
+        """admit() for coroutines; raises Overloaded"""
+        timeout = self.queue_timeout if timeout is None else timeout
+        try:
+            with self._condition:
+                acquired = self._try_acquire()
+            if acquired:
+                waited = 0.0
+            else:
+                waited = await self._wait_for_slot(timeout)
+        except Overloaded as exc:
+            metrics.admission_rejections.inc(reason=exc.reason)
+            raise
+        metrics.admission_wait_seconds.observe(waited)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - started)
+
+    async def _wait_for_slot(self, timeout):
+        with self._condition:
+            if self._waiter_pool is None:
+                # One thread per possible waiter, so a queued request never waits for a thread too
+                self._waiter_pool = ThreadPoolExecutor(max_workers=max(self.max_queue, 1), thread_name_prefix="admission")
+        future = asyncio.get_running_loop().run_in_executor(self._waiter_pool, self._acquire, timeout)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The client went away while queued: hand back the slot if the wait still gets one
+            future.add_done_callback(lambda done: done.cancelled() or done.exception() or self._release(None))
+            raise
+
+    def stats(self):
+        with self._condition:
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout_seconds": self.queue_timeout,
+                "service_seconds": round(self.service_seconds, 4) if self.service_seconds is not None else None,
+            }
+
+
+admission = AdmissionController()
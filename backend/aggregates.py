@@ -0,0 +1,157 @@
+"""
+Streaming per-job-description aggregates
+
+Every finished analysis is folded into the running aggregate of its job
+description (keyed by job_description_id, a hash of the normalized JD
+text):
+- missing-skill and critical-missing-skill histograms
+- match classification counts (classify_match)
+- fixed-width sketches of the final score and each of the 7 factors
+
+Updates are O(skills in one result) and a snapshot costs the same no
+matter how many resumes were folded in, so the applicant pool is never
+re-analyzed to answer "which required skills do most candidates lack".
+
+Aggregates are per process and in memory; at most AGGREGATES_MAX_JOBS
+job descriptions are kept, least recently updated dropped first.
+"""
+
+import hashlib
+import os
+import threading
+from collections import Counter, OrderedDict
+
+AGGREGATES_MAX_JOBS = int(os.environ.get("AGGREGATES_MAX_JOBS", 1000))
+
+SCORE_FIELDS = (
+    "required_skill_coverage",
+    "skill_relevance",
+    "skill_depth_signals",
+    "experience_level_alignment",
+    "domain_context",
+    "ats_optimization",
+    "signal_vs_noise_ratio",
+)
+
+
+def job_description_id(job_description):
+    """Stable ID of a job description: whitespace and case are ignored"""
+    normalized = " ".join(job_description.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+class ScoreSketch:
+    """Histogram of 0-100 scores in 1-point bins: count, mean, min/max, quantiles"""
+
+    BINS = 101
+
+    def __init__(self):
+        self.bins = [0] * self.BINS
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, score):
+        score = min(max(float(score), 0.0), 100.0)
+        self.bins[int(score)] += 1
+        self.count += 1
+        self.total += score
+        self.minimum = score if self.minimum is None else min(self.minimum, score)
+        self.maximum = score if self.maximum is None else max(self.maximum, score)
+
+    def quantile(self, fraction):
+        """Lower edge of the bin holding the given fraction of scores (1-point resolution)"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for score, count in enumerate(self.bins):
+            seen += count
+            if seen >= target and count:
+                return float(score)
+        return self.maximum
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else None,
+            "min": self.minimum,
+            "max": self.maximum,
+            "p25": self.quantile(0.25),
+            "p50": self.quantile(0.50),
+            "p75": self.quantile(0.75),
+            "p90": self.quantile(0.90),
+        }
+
+
+class JobAggregate:
+    """Running totals for every analysis scored against one job description"""
+
+    def __init__(self, job_skills=(), detected_role=None):
+        self.job_skills = list(job_skills)
+        self.detected_role = detected_role
+        self.analyses = 0
+        self.missing_skills = Counter()
+        self.critical_missing_skills = Counter()
+        self.classifications = Counter()
+        self.final_score = ScoreSketch()
+        self.factors = {field: ScoreSketch() for field in SCORE_FIELDS}
+
+    def add(self, result):
+        self.analyses += 1
+        self.missing_skills.update(result["missing_skills"])
+        self.critical_missing_skills.update(result["critical_missing_skills"])
+        self.classifications[result["match_classification"]] += 1
+        self.final_score.add(result["scoring_breakdown"]["final_score"])
+        for field, score in result["score_breakdown_7_factor"].items():
+            if field in self.factors:
+                self.factors[field].add(score)
+
+    def snapshot(self, top_n=20):
+        def skill_histogram(counter):
+            return [
+                {"skill": skill, "count": count, "share": round(count / self.analyses, 4)}
+                for skill, count in counter.most_common(top_n)
+            ]
+
+        return {
+            "job_skills": self.job_skills,
+            "detected_role": self.detected_role,
+            "analyses": self.analyses,
+            "missing_skills": skill_histogram(self.missing_skills),
+            "critical_missing_skills": skill_histogram(self.critical_missing_skills),
+            "match_classification": dict(self.classifications),
+            "final_score": self.final_score.snapshot(),
+            "score_breakdown_7_factor": {field: sketch.snapshot() for field, sketch in self.factors.items()},
+        }
+
+
+class AggregateStore:
+    """Per-JD aggregates with least-recently-updated eviction"""
+
+    def __init__(self, max_jobs=None):
+        self.max_jobs = max_jobs or AGGREGATES_MAX_JOBS
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, job, result):
+        """Fold one /analyze result into the aggregate of its prepared job description"""
+        with self._lock:
+            aggregate = self._jobs.get(job["id"])
+            if aggregate is None:
+                aggregate = self._jobs[job["id"]] = JobAggregate(job["skills"], job["role"])
+                while len(self._jobs) > self.max_jobs:
+                    self._jobs.popitem(last=False)
+            else:
+                self._jobs.move_to_end(job["id"])
+            aggregate.add(result)
+
+    def snapshot(self, job_id, top_n=20):
+        """Aggregate for one job description, or None if nothing was recorded"""
+        with self._lock:
+            aggregate = self._jobs.get(job_id)
+            return aggregate.snapshot(top_n) if aggregate is not None else None
+
+
+aggregates = AggregateStore()
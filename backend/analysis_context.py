@@ -0,0 +1,221 @@
+"""
+Per-document analysis context
+
+Built once per resume and handed to every text-processing stage instead
+of the raw string, so the document is lowercased and scanned once:
+- text / text_lower: original and normalized text
+- section_spans: (start, end) offsets of each resume section into the
+  text, instead of copied substrings
+- tokens: positional indexes (token -> sorted offsets) for a vocabulary
+  within chosen sections
+- features: caps ratio, bullet markers, contact patterns and section
+  header hits, computed together once per document
+
+Everything past the lowercasing is computed lazily on first use.
+Offsets are shared by text and text_lower (lowercasing keeps positions
+for everything resumes contain in practice).
+"""
+
+import heapq
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+
+from skill_matcher import trie_pattern
+
+# Section headers to look for (common patterns); a section starts at the
+# earliest occurrence of any of its markers
+SECTION_MARKERS = {
+    "skills": ("skills", "technical skills", "languages", "technologies", "proficiencies"),
+    "projects": ("projects", "portfolio", "work samples", "applications"),
+    "experience": ("experience", "professional experience", "work experience", "job history", "employment"),
+    "education": ("education", "academic", "degree", "university", "college"),
+}
+SECTION_NAMES = ("skills", "projects", "experience", "education", "other")
+
+# ATS feature terms (factor 6)
+HEADER_TERMS = ("skills", "experience", "projects", "education", "technical")
+CONTACT_TERMS = ("@", "//", "http")
+BULLET_MARKER = "•"
+
+_ASCII_UPPER = bytes(range(ord("A"), ord("Z") + 1))
+
+
+class AnalysisContext:
+    """One resume's text, section offsets, tokens and scan features"""
+
+    def __init__(self, text, section_spans=None):
+        self.text = text
+        self.text_lower = text.lower()
+        self._section_spans = None
+        if section_spans is not None:
+            self._section_spans = {name: tuple(span) for name, span in section_spans.items()}
+        self._sections = None
+        self._features = None
+        self._positions = {}
+
+    @classmethod
+    def from_sections(cls, resume_sections):
+        """
+        Context over a parse_resume_sections() dict
+        Sections are joined with spaces in dict order, each keeping its span
+        """
+        parts = []
+        spans = {}
+        offset = 0
+        for name, section_text in resume_sections.items():
+            if parts:
+                offset += 1
+            spans[name] = (offset, offset + len(section_text))
+            parts.append(section_text)
+            offset += len(section_text)
+        return cls(" ".join(parts), spans)
+
+    # === SECTIONS ===
+
+    @property
+    def section_spans(self):
+        """Section name -> (start, end) offsets; sections not found are absent"""
+        if self._section_spans is None:
+            self._section_spans = _find_section_spans(self.text_lower)
+        return self._section_spans
+
+    def section(self, name):
+        """Original text of one section ("" if absent)"""
+        span = self.section_spans.get(name)
+        return self.text[span[0]:span[1]] if span else ""
+
+    @property
+    def sections(self):
+        """parse_resume_sections()-style dict with every section name"""
+        if self._sections is None:
+            self._sections = {name: self.section(name) for name in SECTION_NAMES}
+        return self._sections
+
+    def contains(self, needle, names=SECTION_NAMES):
+        """Whether lowercase needle occurs inside any of the named sections (no copies)"""
+        spans = self.section_spans
+        find = self.text_lower.find
+        return any(find(needle, *spans[name]) != -1 for name in names if name in spans)
+
+    def search(self, pattern, names=SECTION_NAMES):
+        """First match of a compiled pattern inside the named sections, in name order"""
+        spans = self.section_spans
+        for name in names:
+            if name in spans:
+                match = pattern.search(self.text_lower, *spans[name])
+                if match:
+                    return match
+        return None
+
+    # === TOKENS ===
+
+    def term_positions(self, prefixes, *names):
+        """
+        Positional index over the named sections for one vocabulary:
+        token -> sorted start offsets, for every token beginning with one of
+        prefixes ("build" covers "builds", "building")
+        """
+        key = ("terms", tuple(prefixes)) + names
+        index = self._positions.get(key)
+        if index is None:
+            pattern = _prefix_pattern(tuple(prefixes))
+            index = defaultdict(list)
+            spans = self.section_spans
+            for start, end in sorted(spans[name] for name in names if name in spans):
+                for match in pattern.finditer(self.text_lower, start, end):
+                    index[match.group()].append(match.start())
+            index = self._positions[key] = dict(index)
+        return index
+
+    def prefix_positions(self, prefixes, *names):
+        """Sorted start offsets of every token in term_positions(), merged"""
+        key = ("prefixes", tuple(prefixes)) + names
+        positions = self._positions.get(key)
+        if positions is None:
+            positions = self._positions[key] = list(heapq.merge(*self.term_positions(prefixes, *names).values()))
+        return positions
+
+    def cached(self, key, build):
+        """Per-document memo for indexes other modules derive from this context"""
+        value = self._positions.get(key)
+        if value is None:
+            value = self._positions[key] = build()
+        return value
+
+    # === SCAN FEATURES ===
+
+    @property
+    def features(self):
+        """
+        Character-level features, computed once:
+        caps_ratio, has_bullets, has_contact, header_hits
+        """
+        if self._features is None:
+            text = self.text
+            text_lower = self.text_lower
+            # A handful of C-level substring searches beat one Python-visible scan
+            self._features = {
+                "caps_ratio": _count_upper(text) / max(len(text), 1),
+                "has_bullets": BULLET_MARKER in text or "-" in text[:100],
+                "has_contact": any(term in text_lower for term in CONTACT_TERMS),
+                "header_hits": [term for term in HEADER_TERMS if term in text_lower],
+            }
+        return self._features
+
+
+def _count_upper(text):
+    if text.isascii():
+        encoded = text.encode("ascii")
+        return len(encoded) - len(encoded.translate(None, _ASCII_UPPER))
+    return sum(map(str.isupper, text))
+
+
+def _find_section_spans(text_lower):
+    positions = {}
+    for name, markers in SECTION_MARKERS.items():
+        found = [position for position in map(text_lower.find, markers) if position != -1]
+        if found:
+            positions[name] = min(found)
+
+    if not positions:
+        return {"other": (0, len(text_lower))}
+
+    # Each section runs to the start of the next one (or the end of the text)
+    ordered = sorted(positions.items(), key=lambda item: item[1])
+    spans = {}
+    for i, (name, start) in enumerate(ordered):
+        end = ordered[i + 1][1] if i + 1 < len(ordered) else len(text_lower)
+        spans[name] = (start, end)
+    return spans
+
+
+@lru_cache(maxsize=64)
+def _prefix_pattern(prefixes):
+    # Trie-factored so the cost per position stays flat as the vocabulary grows
+    return re.compile(r"\b" + trie_pattern(prefixes) + r"\w*")
+
+
+def any_within(positions, others, window):
+    """
+    Whether some offset in positions is at most window away from some
+    offset in others (both sorted): one binary search per position,
+    stopping at the first hit
+    """
+    if not others:
+        return False
+    for position in positions:
+        i = bisect_left(others, position - window)
+        if i < len(others) and others[i] <= position + window:
+            return True
+    return False
+
+
+def as_context(resume):
+    """AnalysisContext for a context, resume text or parse_resume_sections() dict"""
+    if isinstance(resume, AnalysisContext):
+        return resume
+    if isinstance(resume, str):
+        return AnalysisContext(resume)
+    return AnalysisContext.from_sections(resume)
@@ -0,0 +1,332 @@
+"""
+Resume analysis pipeline
+
+Split into a job-description half and a resume half so a JD can be
+prepared once and then scored against any number of resumes:
+- prepare_job_description(): JD ID, skills (and their bitmap), role,
+  domain profile and similarity vector
+- analyze_resume_text(): resume parsing, gap analysis, 7-factor scoring,
+  in two halves: score_skills() needs only the JD's skill set, and
+  score_response() adds the parts that read the JD text. Stored
+  analyses (CandidateIndex.rescore) feed the same two functions
+
+load_resume() sits in front of PDF extraction and section parsing and
+serves repeat uploads of the same file from the extraction cache.
+extract_resume(), cached_resume() and extraction_cache_entry() are its
+parts, for callers that keep the cache in another process. The
+resume travels through the pipeline as an AnalysisContext, so it is
+lowercased and scanned once however many stages read it.
+
+Each function takes an optional metrics.StageTimer and records its
+stages into it; callers fold the timings into the /metrics histograms.
+"""
+
+from analysis_context import AnalysisContext
+from pdf_extraction import extract_pdf
+from extraction_cache import extraction_cache, hash_pdf_source
+from resume_parser import extract_experience_level, detect_domain_context, domain_profile
+from skill_extractor import extract_skills, detect_job_role
+from similarity import calculate_similarity, job_similarity_vector
+from gap_analyzer import skill_gap_masks, classify_match, generate_comprehensive_suggestions
+from comprehensive_scorer import ComprehensiveScorer
+from metrics import StageTimer
+from aggregates import job_description_id
+from taxonomy import get_taxonomy
+
+
+def prepare_job_description(job_description, timer=None):
+    """
+    Run the JD-only stages once
+    Returns a plain dict so it can be shipped to worker processes
+    """
+    timer = timer or StageTimer()
+    taxonomy = get_taxonomy()
+    with timer.stage("jd_skill_extraction"):
+        jd_skills = extract_skills(job_description)
+        jd_skill_mask = taxonomy.mask(jd_skills)
+    with timer.stage("role_detection"):
+        detected_role = detect_job_role(jd_skill_mask)
+    with timer.stage("jd_context"):
+        jd_domain_profile = domain_profile(job_description.lower())
+        similarity_vector = job_similarity_vector(job_description)
+    return {
+        "id": job_description_id(job_description),
+        "text": job_description,
+        "skills": jd_skills,
+        "skill_mask": jd_skill_mask,
+        "taxonomy_version": taxonomy.version,
+        "role": detected_role,
+        "domain_profile": jd_domain_profile,
+        "similarity_vector": similarity_vector,
+    }
+
+
+def job_skill_mask(job, taxonomy):
+    """The prepared JD's skill bitmap, rebuilt if the taxonomy was swapped since"""
+    if job.get("taxonomy_version") == taxonomy.version:
+        return job["skill_mask"]
+    return taxonomy.mask(job["skills"])
+
+
+def load_resume(pdf_source, workers=None, timer=None, pdf_hash=None):
+    """
+    Extract and section a resume PDF through the extraction cache
+    pdf_source: file path, raw PDF bytes, or a binary file-like object
+    pdf_hash: hash_pdf_source() of it, if the caller already computed it
+
+    Returns (resume_text, AnalysisContext, extraction report)
+    """
+    timer = timer or StageTimer()
+    if hasattr(pdf_source, "read"):
+        pdf_source = pdf_source.read()
+
+    with timer.stage("extraction_cache_lookup"):
+        key = pdf_hash or hash_pdf_source(pdf_source)
+        cached = extraction_cache.get(key)
+    if cached is not None:
+        return cached_resume(cached)
+
+    resume_text, context, extraction = extract_resume(pdf_source, workers=workers, timer=timer)
+    # Don't pin partial text from timed-out pages in the cache
+    if extraction_complete(extraction):
+        extraction_cache.put(key, extraction_cache_entry(resume_text, context, extraction))
+
+    return resume_text, context, dict(extraction, cache="miss")
+
+
+def extract_resume(pdf_source, workers=None, timer=None):
+    """
+    Extract and section a resume PDF without the extraction cache
+    Returns (resume_text, AnalysisContext, extraction report)
+    """
+    timer = timer or StageTimer()
+    with timer.stage("pdf_extraction"):
+        extraction = extract_pdf(pdf_source, workers=workers)
+    resume_text = extraction.pop("text")
+    with timer.stage("section_parsing"):
+        context = AnalysisContext(resume_text)
+        context.section_spans  # Found lazily; timed here rather than in the first stage that reads it
+    return resume_text, context, extraction
+
+
+def cached_resume(entry):
+    """load_resume()'s result for an extraction cache entry"""
+    context = AnalysisContext(entry["text"], entry["section_spans"])
+    return entry["text"], context, dict(entry["report"], cache="hit")
+
+
+def extraction_cache_entry(resume_text, context, extraction):
+    """Extraction cache entry for an extract_resume() result"""
+    return {"text": resume_text, "section_spans": context.section_spans, "report": extraction}
+
+
+def extraction_complete(extraction):
+    """Whether an extraction report covers every page it attempted (none timed out)"""
+    return all(page["status"] != "timed_out" for page in extraction["pages"])
+
+
+def analyze_resume_text(resume_text, job, context=None, timer=None):
+    """
+    Score one resume's text against a prepared job description
+    context: the resume's AnalysisContext, if already built by load_resume()
+    Returns the /analyze response dict
+    """
+    timer = timer or StageTimer()
+
+    # === RESUME PARSING ===
+    if context is None:
+        with timer.stage("section_parsing"):
+            context = AnalysisContext(resume_text)
+            context.section_spans
+    with timer.stage("skill_extraction"):
+        resume_skills = extract_skills(context)
+    with timer.stage("experience_level"):
+        experience_level = extract_experience_level(context)
+
+    skill_scores = score_skills(
+        resume_skills, experience_level, job,
+        lambda matched_skills: ComprehensiveScorer.skill_depth_points(context, matched_skills), timer=timer,
+    )
+
+    with timer.stage("factor_5_domain_context"):
+        domain_relevance = detect_domain_context(context, job["text"], jd_domain_profile=job["domain_profile"])
+    with timer.stage("factor_6_ats_optimization"):
+        ats_features = ComprehensiveScorer.ats_features(context)
+
+    # === TEXT SIMILARITY (for reference) ===
+    with timer.stage("similarity"):
+        text_similarity = calculate_similarity(resume_text, job["text"], jd_vector=job["similarity_vector"])
+
+    return score_response(
+        resume_skills, experience_level, job, skill_scores, domain_relevance, ats_features, text_similarity, timer=timer
+    )
+
+
+def score_skills(resume_skills, experience_level, job, depth_points, timer=None):
+    """
+    The scoring that depends on the JD only through its skill set (and the
+    role detected from it): skill gaps and factors 1-4 and 7
+    depth_points: callable(matched_skills) -> ComprehensiveScorer.skill_depth_points()
+
+    Returns a dict for score_response(); reusable for any JD with the same skill set
+    """
+    timer = timer or StageTimer()
+    jd_skills = job["skills"]
+    detected_role = job["role"]
+
+    # === SKILL GAP ANALYSIS ===
+    # One bitwise operation per skill set; names are materialized once, in skill-ID order
+    with timer.stage("gap_analysis"):
+        taxonomy = get_taxonomy()
+        gap = skill_gap_masks(
+            taxonomy.mask(resume_skills), job_skill_mask(job, taxonomy), taxonomy.core_masks.get(detected_role, 0)
+        )
+        matched_skills = taxonomy.skills_from_mask(gap["matched"])
+        missing_skills = taxonomy.skills_from_mask(gap["missing"])
+        bonus_skills = taxonomy.skills_from_mask(gap["bonus"])
+        critical_missing_skills = taxonomy.skills_from_mask(gap["critical_missing"])
+
+    # === 7-FACTOR SCORING ===
+    scorer = ComprehensiveScorer(detected_role, experience_level)
+
+    # Factor 1: Required skill coverage (40%)
+    with timer.stage("factor_1_required_skills"):
+        factor1 = scorer.score_factor_1_required_skills(matched_skills, jd_skills, missing_skills)
+
+    # Factor 2: Skill relevance (25%)
+    with timer.stage("factor_2_skill_relevance"):
+        factor2 = scorer.score_factor_2_skill_relevance(resume_skills, jd_skills)
+
+    # Factor 3: Skill depth signals (15%)
+    with timer.stage("factor_3_skill_depth"):
+        factor3 = scorer.score_skill_depth_points(depth_points(matched_skills), len(matched_skills))
+
+    # Factor 4: Experience alignment (10%)
+    with timer.stage("factor_4_experience_alignment"):
+        factor4 = scorer.score_factor_4_experience_alignment(len(missing_skills), len(jd_skills))
+
+    # Factor 7: Signal vs noise (2%)
+    with timer.stage("factor_7_signal_noise"):
+        factor7 = scorer.score_factor_7_signal_noise_ratio(bonus_skills, missing_skills)
+
+    return {
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+        "bonus_skills": bonus_skills,
+        "critical_missing_skills": critical_missing_skills,
+        "factor_scores": {
+            "required_skills": factor1,
+            "skill_relevance": factor2,
+            "skill_depth": factor3,
+            "experience_alignment": factor4,
+            "signal_noise": factor7,
+        },
+    }
+
+
+def score_response(resume_skills, experience_level, job, skill_scores, domain_relevance, ats_features, text_similarity, timer=None):
+    """
+    Finish scoring from score_skills() and the JD-text-dependent inputs:
+    factors 5 and 6, final score, classification, suggestions
+    domain_relevance: detect_domain_context() score
+    ats_features: ComprehensiveScorer.ats_features() tuple
+
+    Returns the /analyze response dict
+    """
+    timer = timer or StageTimer()
+    jd_skills = job["skills"]
+    detected_role = job["role"]
+    matched_skills = skill_scores["matched_skills"]
+    missing_skills = skill_scores["missing_skills"]
+    bonus_skills = skill_scores["bonus_skills"]
+    critical_missing_skills = skill_scores["critical_missing_skills"]
+
+    scorer = ComprehensiveScorer(detected_role, experience_level)
+
+    # Factor 5: Domain context (5%)
+    factor5 = scorer.score_factor_5_domain_context(domain_relevance)
+
+    # Factor 6: ATS optimization (3%)
+    factor6 = scorer.score_ats_features(ats_features)
+
+    # Calculate weighted final score
+    factor_scores = dict(skill_scores["factor_scores"], domain_context=factor5, ats_optimization=factor6)
+    factor1 = factor_scores["required_skills"]
+    factor2 = factor_scores["skill_relevance"]
+    factor3 = factor_scores["skill_depth"]
+    factor4 = factor_scores["experience_alignment"]
+    factor7 = factor_scores["signal_noise"]
+
+    final_7_factor_score = scorer.calculate_weighted_score(factor_scores)
+
+    # === MATCH CLASSIFICATION (confidence-aware) ===
+    match_classification = classify_match(final_7_factor_score, critical_missing_skills)
+
+    # === SUGGESTIONS (role-aware) ===
+    with timer.stage("suggestions"):
+        suggestions = generate_comprehensive_suggestions(
+            missing_skills,
+            resume_skills,
+            bonus_skills,
+            final_7_factor_score,
+            len(matched_skills),
+            len(jd_skills),
+            detected_role=detected_role,
+            critical_missing_skills=critical_missing_skills
+        )
+
+    # === SIMPLIFIED METRICS ===
+    skill_match_percentage = int((len(matched_skills) / len(jd_skills)) * 100) if len(jd_skills) > 0 else 0
+    bonus_percentage = min(len(bonus_skills) * 2, 20)  # Cap bonus at 20%
+
+    # === RESPONSE ===
+    return {
+        "job_description_id": job["id"],
+        "resume_skills": resume_skills,
+        "job_skills": jd_skills,
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+        "bonus_skills": bonus_skills,
+        "detected_role": detected_role,
+        "experience_level": experience_level,
+        "critical_missing_skills": critical_missing_skills,
+        "match_classification": match_classification,
+
+        # Simplified Metrics
+        "skill_match_percentage": skill_match_percentage,
+        "bonus_percentage": bonus_percentage,
+
+        # 7-Factor Score Breakdown (PRIMARY)
+        "score_breakdown_7_factor": {
+            "required_skill_coverage": factor1,
+            "skill_relevance": factor2,
+            "skill_depth_signals": factor3,
+            "experience_level_alignment": factor4,
+            "domain_context": factor5,
+            "ats_optimization": factor6,
+            "signal_vs_noise_ratio": factor7,
+        },
+
+        # Legacy 3-layer breakdown (kept for compatibility)
+        "scoring_breakdown": {
+            "final_score": final_7_factor_score,
+            "text_similarity_score": round(text_similarity, 2)
+        },
+
+        "suggestions": suggestions
+    }
+
+
+def analyze_resume_bytes(pdf_bytes, job):
+    """Extract an in-memory PDF and score it (process pool entry point)"""
+    timer = StageTimer()
+    # Already running in a pool worker: parallelism is across resumes, not pages
+    resume_text, context, extraction = load_resume(pdf_bytes, workers=1, timer=timer)
+    result = analyze_resume_text(resume_text, job, context, timer=timer)
+    # Timings travel back with the result so the serving process can record them
+    result["diagnostics"] = {
+        "pdf_extraction": extraction,
+        "stage_seconds": timer.seconds,
+        "text_chars": len(resume_text),
+    }
+    return result
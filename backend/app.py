@@ -1,14 +1,140 @@
-from flask import Flask, request, jsonify
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 
-from resume_parser import extract_text_from_pdf, parse_resume_sections, extract_experience_level, detect_domain_context
-from skill_extractor import extract_skills, detect_job_role, get_critical_missing_skills
-from similarity import calculate_similarity, calculate_comprehensive_score
-from gap_analyzer import find_skill_gap, get_bonus_skills, classify_match, generate_comprehensive_suggestions
-from comprehensive_scorer import ComprehensiveScorer
+from admission import admission, Overloaded, MAX_RESUME_BYTES, MAX_RESUME_PAGES
+from extraction_cache import extraction_cache, hash_pdf_source
+from pdf_extraction import count_pages
+from response_cache import response_cache, response_key, etag
+from aggregates import aggregates, job_description_id
+from analysis_pipeline import load_resume, prepare_job_description, analyze_resume_text, analyze_resume_bytes, extraction_complete
+from uploads import resume_upload_source, detach_upload, upload_size
+from taxonomy import get_taxonomy, reload_taxonomy
+from candidate_index import get_candidate_index
+from job_queue import get_job_queue
+from warmup import warm_up
+import metrics
 
 app = Flask(__name__)
-CORS(app)
+# Any origin (echoed back, with Vary: Origin); ETag readable by browser clients. asgi.py matches this
+CORS(app, expose_headers=["ETag"])
+
+# Whole request bodies above this are refused (413) before any form parsing
+MAX_REQUEST_BYTES = int(os.environ.get("MAX_REQUEST_BYTES", 256 * 1024 * 1024))
+app.config["MAX_CONTENT_LENGTH"] = MAX_REQUEST_BYTES
+
+# Worker processes used to fan batch resumes out (PDF parsing is CPU bound)
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", os.cpu_count() or 1))
+# Resumes in flight per streamed batch
+BATCH_STREAM_WINDOW = int(os.environ.get("BATCH_STREAM_WINDOW", BATCH_MAX_WORKERS * 2))
+_batch_pool = None
+
+
+def get_batch_pool():
+    """Create the shared batch worker pool on first use"""
+    global _batch_pool
+    if _batch_pool is None:
+        _batch_pool = ProcessPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+    return _batch_pool
+
+
+metrics.register_counter(
+    "resume_analyzer_extraction_cache_lookups_total",
+    "Extraction cache lookups by result (this process)",
+    lambda: {
+        (("result", name),): value
+        for name, value in extraction_cache.stats().items()
+        if name in ("memory_hits", "disk_hits", "misses")
+    },
+)
+metrics.register_gauge(
+    "resume_analyzer_extraction_cache_hit_ratio",
+    "Extraction cache hit ratio (this process)",
+    lambda: extraction_cache.stats()["hit_rate"],
+)
+metrics.register_counter(
+    "resume_analyzer_response_cache_lookups_total",
+    "/analyze response cache lookups by result (this process)",
+    lambda: {
+        (("result", name),): value
+        for name, value in response_cache.stats().items()
+        if name in ("hits", "misses")
+    },
+)
+metrics.register_gauge(
+    "resume_analyzer_admission_active",
+    "Analyses holding an admission slot (this process)",
+    lambda: admission.stats()["active"],
+)
+metrics.register_gauge(
+    "resume_analyzer_admission_queue_depth",
+    "Requests waiting for an admission slot (this process)",
+    lambda: admission.stats()["waiting"],
+)
+metrics.register_gauge(
+    "resume_analyzer_jobs_pending",
+    "Analysis jobs submitted by this process that have not finished",
+    lambda: get_job_queue().pending_count(),
+)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or "unknown"
+    metrics.requests_total.inc(endpoint=endpoint, status=str(response.status_code))
+    started = g.get("request_started")
+    if started is not None:
+        metrics.request_seconds.observe(time.perf_counter() - started, endpoint=endpoint)
+    return response
+
+
+@app.errorhandler(Overloaded)
+def overloaded(exc):
+    response = jsonify({"error": str(exc)})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(exc.retry_after)
+    return response
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(exc):
+    metrics.admission_rejections.inc(reason="too_large")
+    return jsonify({"error": f"Request body is larger than {app.config['MAX_CONTENT_LENGTH']} bytes"}), 413
+
+
+def _resume_too_large():
+    metrics.admission_rejections.inc(reason="too_large")
+    return jsonify({"error": f"Resume upload is larger than {MAX_RESUME_BYTES} bytes"}), 413
+
+
+def _page_limit_message(resume_source):
+    """Error message if a resume is over the page limit, checked before extraction"""
+    try:
+        page_count = count_pages(resume_source)
+    except Exception:
+        return None  # Unreadable PDFs fail in extraction, as before
+    if page_count > MAX_RESUME_PAGES:
+        metrics.admission_rejections.inc(reason="too_many_pages")
+        return f"Resume has {page_count} pages; the limit is {MAX_RESUME_PAGES}"
+    return None
+
+
+def _resume_limit_error(resume_source):
+    """413 response if a resume is over the page limit, checked before extraction"""
+    message = _page_limit_message(resume_source)
+    if message is not None:
+        return jsonify({"error": message}), 413
+    return None
+
 
 @app.route("/", methods=["GET"])
 def home():
@@ -21,10 +147,25 @@ def analyze_resume():
     Expects:
     - resume file (PDF)
     - job_description (text)
-    
-    Returns: Comprehensive analysis with 7-factor scoring
+    - async (optional): "1" to run the analysis as a background job
+    - wait (optional): seconds to wait for the job before answering
+      (implies async, capped at JOB_MAX_WAIT)
+
+    Returns: Comprehensive analysis with 7-factor scoring, with an ETag;
+    repeats are served from the response cache, and a matching
+    If-None-Match gets 304
+    In job mode: the job record, with the result if it finished within
+    the wait (200), otherwise 202 and the job ID to poll at /jobs/<id>
+
+    Resumes over MAX_RESUME_BYTES or MAX_RESUME_PAGES get 413; when every
+    analysis slot is taken and the wait queue is full (or the wait runs
+    past its deadline) the answer is 503 with Retry-After
     """
 
+    # Checked on the declared length, before the upload is parsed
+    if request.content_length and request.content_length > MAX_RESUME_BYTES:
+        return _resume_too_large()
+
     if "resume" not in request.files:
         return jsonify({"error": "Resume file is required"}), 400
 
@@ -34,126 +175,458 @@ def analyze_resume():
     if job_description.strip() == "":
         return jsonify({"error": "Job description is required"}), 400
 
-    # Save resume temporarily
-    resume_path = "uploaded_resume.pdf"
-    resume_file.save(resume_path)
-
-    # === RESUME PARSING ===
-    resume_text = extract_text_from_pdf(resume_path)
-    resume_sections = parse_resume_sections(resume_text)
-    resume_skills = extract_skills(resume_text)
-    experience_level = extract_experience_level(resume_sections)
-
-    # === JOB ANALYSIS ===
-    jd_skills = extract_skills(job_description)
-    detected_role = detect_job_role(jd_skills)
-
-    # === SKILL GAP ANALYSIS ===
-    missing_skills = find_skill_gap(resume_skills, jd_skills)
-    bonus_skills = get_bonus_skills(resume_skills, jd_skills)
-    critical_missing_skills = get_critical_missing_skills(missing_skills, detected_role)
-    matched_skills = [skill for skill in resume_skills if skill in jd_skills]
-
-    # === 7-FACTOR SCORING ===
-    scorer = ComprehensiveScorer(detected_role, experience_level)
-    
-    # Factor 1: Required skill coverage (40%)
-    factor1 = scorer.score_factor_1_required_skills(matched_skills, jd_skills, missing_skills)
-    
-    # Factor 2: Skill relevance (25%)
-    factor2 = scorer.score_factor_2_skill_relevance(resume_skills, jd_skills)
-    
-    # Factor 3: Skill depth signals (15%)
-    factor3 = scorer.score_factor_3_skill_depth(resume_sections, matched_skills)
-    
-    # Factor 4: Experience alignment (10%)
-    factor4 = scorer.score_factor_4_experience_alignment(len(missing_skills), len(jd_skills))
-    
-    # Factor 5: Domain context (5%)
-    domain_relevance = detect_domain_context(resume_sections, job_description)
-    factor5 = scorer.score_factor_5_domain_context(domain_relevance)
-    
-    # Factor 6: ATS optimization (3%)
-    factor6 = scorer.score_factor_6_ats_optimization(resume_text)
-    
-    # Factor 7: Signal vs noise (2%)
-    factor7 = scorer.score_factor_7_signal_noise_ratio(bonus_skills, missing_skills)
-    
-    # Calculate weighted final score
-    factor_scores = {
-        "required_skills": factor1,
-        "skill_relevance": factor2,
-        "skill_depth": factor3,
-        "experience_alignment": factor4,
-        "domain_context": factor5,
-        "ats_optimization": factor6,
-        "signal_noise": factor7,
+    # And on the file itself: chunked bodies declare no length
+    if upload_size(resume_file) > MAX_RESUME_BYTES:
+        return _resume_too_large()
+
+    # === JOB MODE ===
+    wait = request.values.get("wait")
+    if wait is not None or request.values.get("async", "").lower() in ("1", "true", "yes"):
+        try:
+            wait_seconds = float(wait or 0)
+        except ValueError:
+            return jsonify({"error": "wait must be a number of seconds"}), 400
+
+        # Limits first: a rejected upload shouldn't pay for JD preparation
+        pdf_bytes = resume_file.read()
+        limit_error = _resume_limit_error(pdf_bytes)
+        if limit_error is not None:
+            return limit_error
+
+        job_timer = metrics.StageTimer()
+        job = prepare_job_description(job_description, timer=job_timer)
+        for stage, seconds in job_timer.seconds.items():
+            metrics.stage_seconds.observe(seconds, stage=stage)
+
+        job_queue = get_job_queue()
+        job_id = job_queue.submit(pdf_bytes, job, filename=resume_file.filename)
+        return _job_response(job_queue.wait(job_id, wait_seconds))
+
+    # === RESUME PARSING + SCORING ===
+    # Parsed from memory; nothing shared on disk between concurrent requests
+    timer = metrics.StageTimer()
+    with resume_upload_source(resume_file) as resume_source:
+        pdf_hash = hash_pdf_source(resume_source)
+        cache_key = response_key(pdf_hash, job_description)
+        response_etag = etag(cache_key)
+        if request.if_none_match.contains(response_etag):
+            not_modified = app.response_class(status=304)
+            not_modified.set_etag(response_etag)
+            return not_modified
+
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            # Served as stored; not folded into the aggregates a second time
+            response = jsonify(dict(cached, diagnostics=dict(cached["diagnostics"], response_cache="hit")))
+            response.set_etag(response_etag)
+            return response
+
+        limit_error = _resume_limit_error(resume_source)
+        if limit_error is not None:
+            return limit_error
+
+        # Extraction and scoring hold one admission slot (Overloaded -> 503)
+        with admission.admit():
+            resume_text, context, extraction = load_resume(resume_source, timer=timer, pdf_hash=pdf_hash)
+            job = prepare_job_description(job_description, timer=timer)
+            response = analyze_resume_text(resume_text, job, context, timer=timer)
+
+    response["diagnostics"] = {
+        "pdf_extraction": extraction,
+        "stage_seconds": timer.seconds,
     }
-    
-    final_7_factor_score = scorer.calculate_weighted_score(factor_scores)
-    
-    # === TEXT SIMILARITY (for reference) ===
-    text_similarity = calculate_similarity(resume_text, job_description)
-
-    # === MATCH CLASSIFICATION (confidence-aware) ===
-    match_classification = classify_match(final_7_factor_score, critical_missing_skills)
-
-    # === SUGGESTIONS (role-aware) ===
-    suggestions = generate_comprehensive_suggestions(
-        missing_skills,
-        resume_skills,
-        bonus_skills,
-        final_7_factor_score,
-        len(matched_skills),
-        len(jd_skills),
-        detected_role=detected_role,
-        critical_missing_skills=critical_missing_skills
-    )
-
-    # === SIMPLIFIED METRICS ===
-    skill_match_percentage = int((len(matched_skills) / len(jd_skills)) * 100) if len(jd_skills) > 0 else 0
-    bonus_percentage = min(len(bonus_skills) * 2, 20)  # Cap bonus at 20%
-    
-    # === RESPONSE ===
-    response = {
-        "resume_skills": resume_skills,
-        "job_skills": jd_skills,
-        "matched_skills": matched_skills,
-        "missing_skills": missing_skills,
-        "bonus_skills": bonus_skills,
-        "detected_role": detected_role,
-        "experience_level": experience_level,
-        "critical_missing_skills": critical_missing_skills,
-        "match_classification": match_classification,
-        
-        # Simplified Metrics
-        "skill_match_percentage": skill_match_percentage,
-        "bonus_percentage": bonus_percentage,
-        
-        # 7-Factor Score Breakdown (PRIMARY)
-        "score_breakdown_7_factor": {
-            "required_skill_coverage": factor1,
-            "skill_relevance": factor2,
-            "skill_depth_signals": factor3,
-            "experience_level_alignment": factor4,
-            "domain_context": factor5,
-            "ats_optimization": factor6,
-            "signal_vs_noise_ratio": factor7,
-        },
-        
-        # Legacy 3-layer breakdown (kept for compatibility)
-        "scoring_breakdown": {
-            "final_score": final_7_factor_score,
-            "text_similarity_score": round(text_similarity, 2)
-        },
-        
-        "suggestions": suggestions
+    metrics.observe_analysis(timer.seconds, extraction, len(resume_text))
+    aggregates.record(job, response)
+    # A partial analysis (timed-out pages) is neither cached nor tagged: a retry may get all of it
+    complete = extraction_complete(extraction)
+    if complete:
+        response_cache.put(cache_key, response)
+
+    response = jsonify(dict(response, diagnostics=dict(response["diagnostics"], response_cache="miss")))
+    if complete:
+        response.set_etag(response_etag)
+    return response
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    """
+    Status of an /analyze job: queued, running, done or failed
+    - wait (optional): seconds to wait for it to finish (capped at JOB_MAX_WAIT)
+    """
+    try:
+        wait_seconds = float(request.args.get("wait", 0))
+    except ValueError:
+        return jsonify({"error": "wait must be a number of seconds"}), 400
+
+    record = get_job_queue().wait(job_id, wait_seconds)
+    if record is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return _job_response(record)
+
+
+def _job_response(record):
+    """200 with the finished job record, 202 while it is still pending"""
+    response = jsonify(record)
+    if record["status"] in ("done", "failed"):
+        return response
+    response.status_code = 202
+    response.headers["Location"] = f"/jobs/{record['job_id']}"
+    return response
+
+
+@app.route("/analyze_batch", methods=["POST"])
+def analyze_batch():
+    """
+    Expects:
+    - resumes: one or more resume files (PDF)
+    - job_description (text)
+    - stream (optional): "1" (or Accept: application/x-ndjson) to stream
+      newline-delimited JSON as resumes finish
+
+    The job description is analyzed once, then every resume is scored
+    against it in the worker pool, each holding an admission slot while
+    it runs (see _run_batch).
+    Returns: one /analyze result per resume, in upload order; resumes
+    over MAX_RESUME_BYTES or MAX_RESUME_PAGES get an error entry
+    Streaming: a first line with the job fields, then one line per resume
+    in completion order, each carrying its upload "index"
+    503 with Retry-After when not even the first resume can be admitted
+    """
+
+    resume_files = request.files.getlist("resumes")
+    if not resume_files:
+        return jsonify({"error": "At least one resume file is required"}), 400
+
+    job_description = request.form.get("job_description", "")
+
+    if job_description.strip() == "":
+        return jsonify({"error": "Job description is required"}), 400
+
+    # === JOB ANALYSIS (once per batch) ===
+    job_timer = metrics.StageTimer()
+    job = prepare_job_description(job_description, timer=job_timer)
+    for stage, seconds in job_timer.seconds.items():
+        metrics.stage_seconds.observe(seconds, stage=stage)
+
+    header = {
+        "job_description_id": job["id"],
+        "job_skills": job["skills"],
+        "detected_role": job["role"],
+        "resume_count": len(resume_files),
     }
 
-    return jsonify(response)
+    if request.values.get("stream", "").lower() in ("1", "true", "yes") or \
+            request.accept_mimetypes.best == "application/x-ndjson":
+        uploads = [(resume_file.filename, detach_upload(resume_file)) for resume_file in resume_files]
+        records = _run_batch(uploads, job)
+        next(records)  # First resumes admitted (Overloaded -> 503) before the response starts
+        return Response(_stream_batch(records, header), mimetype="application/x-ndjson")
+
+    # === RESUMES (fanned out across workers) ===
+    records = _run_batch([(resume_file.filename, resume_file.stream) for resume_file in resume_files], job)
+    next(records)
+    results = [None] * len(resume_files)
+    for index, record in records:
+        results[index] = record
+
+    return jsonify(dict(header, resume_count=len(results), results=results))
+
+
+def _batch_result(filename, future, job):
+    """One finished batch future as its response entry, recorded in metrics and aggregates"""
+    try:
+        result = future.result()
+    except Exception as exc:
+        # One unreadable PDF should not fail the whole batch
+        return {"filename": filename, "error": f"Could not analyze resume: {exc}"}
+    diagnostics = result["diagnostics"]
+    metrics.observe_analysis(diagnostics["stage_seconds"], diagnostics["pdf_extraction"], diagnostics.pop("text_chars"))
+    aggregates.record(job, result)
+    result["filename"] = filename
+    return result
+
+
+def _stream_batch(records, header):
+    """NDJSON lines for a batch: the header, then each _run_batch() record as it finishes"""
+    try:
+        yield app.json.dumps(header) + "\n"
+        for index, record in records:
+            yield app.json.dumps(dict(record, index=index)) + "\n"
+    finally:
+        # Client gone: cancel what hasn't started
+        records.close()
+
+
+def _run_batch(uploads, job):
+    """
+    Score a batch's resumes in the worker pool
+    uploads: (filename, binary file) pairs, closed here
+
+    Yields None once the first resumes are submitted, then (upload index,
+    result entry) per resume as it finishes. At most BATCH_STREAM_WINDOW
+    resumes are in flight, each holding an admission slot until its
+    analysis is done; the next upload is read only when one completes,
+    so memory stays flat with batch size. While some of its resumes are
+    in flight a batch takes free slots only, never queueing behind
+    itself. Resumes over the size or page limit get an error entry
+    without being analyzed. Overloaded before any resume was admitted is
+    raised; after that, a resume that can't be admitted gets an error
+    entry. Closing the generator cancels the resumes not yet started.
+    """
+    pool = get_batch_pool()
+    pending_uploads = iter(enumerate(uploads))
+    in_flight = {}
+    finished = []  # (index, entry) for resumes that never reached the pool
+    deferred = None  # (index, filename, PDF bytes) read, waiting for a free slot
+    admitted = False
+
+    def submit_next():
+        """Submit the next resume within limits; False when none is left or no slot is free"""
+        nonlocal deferred, admitted
+        while True:
+            if deferred is not None:
+                index, filename, pdf_bytes = deferred
+            else:
+                item = next(pending_uploads, None)
+                if item is None:
+                    return False
+                index, (filename, upload) = item
+                with upload:
+                    if upload_size(upload) > MAX_RESUME_BYTES:
+                        metrics.admission_rejections.inc(reason="too_large")
+                        error = f"Resume upload is larger than {MAX_RESUME_BYTES} bytes"
+                    else:
+                        pdf_bytes = upload.read()
+                        error = _page_limit_message(pdf_bytes)
+                if error is not None:
+                    finished.append((index, {"filename": filename, "error": error}))
+                    continue
+
+            try:
+                # With resumes in flight, wait for those rather than in the admission queue
+                release = admission.try_acquire() if in_flight else admission.acquire()
+            except Overloaded as exc:
+                if not admitted:
+                    raise
+                deferred = None
+                finished.append((index, {"filename": filename, "error": str(exc)}))
+                continue
+            if release is None:
+                deferred = (index, filename, pdf_bytes)
+                return False
+
+            deferred = None
+            admitted = True
+            future = pool.submit(analyze_resume_bytes, pdf_bytes, job)
+            future.add_done_callback(lambda _: release())
+            in_flight[future] = (index, filename)
+            return True
+
+    def fill():
+        while len(in_flight) < BATCH_STREAM_WINDOW and submit_next():
+            pass
+
+    try:
+        fill()
+        yield None
+        while True:
+            while finished:
+                yield finished.pop(0)
+            if not in_flight:
+                if deferred is None:
+                    break
+                fill()
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            done = [(future, in_flight.pop(future)) for future in done]
+            fill()
+            for future, (index, filename) in done:
+                yield index, _batch_result(filename, future, job)
+    finally:
+        for future in in_flight:
+            future.cancel()
+        for _, (_, upload) in pending_uploads:
+            upload.close()
+
+
+@app.route("/aggregates", methods=["GET", "POST"])
+def job_aggregates():
+    """
+    Pool-wide aggregates for one job description
+    - job_id: a job_description_id from an analysis response, or
+    - job_description (text): the JD itself
+    - top (optional, default 20): skills listed per histogram
+
+    Returns: missing / critical-missing skill histograms, match
+    classification counts and score distributions over every resume
+    analyzed against that JD so far (this process)
+    """
+    job_id = request.values.get("job_id")
+    if not job_id:
+        job_description = request.values.get("job_description", "")
+        if job_description.strip() == "":
+            return jsonify({"error": "job_id or job_description is required"}), 400
+        job_id = job_description_id(job_description)
+
+    try:
+        top_n = int(request.values.get("top", 20))
+    except ValueError:
+        return jsonify({"error": "top must be an integer"}), 400
+
+    snapshot = aggregates.snapshot(job_id, top_n=max(top_n, 1))
+    if snapshot is None:
+        return jsonify({"error": "No analyses recorded for this job description"}), 404
+    return jsonify(dict(snapshot, job_description_id=job_id))
+
+
+@app.route("/index", methods=["POST"])
+def index_resumes():
+    """
+    Expects:
+    - resumes: one or more resume files (PDF)
+    - candidate_ids (optional): one per resume, defaults to the filename
+
+    Analyzes each resume once and stores it in the candidate index; the
+    request holds one admission slot while it does (503 when overloaded)
+    """
+    resume_files = request.files.getlist("resumes")
+    if not resume_files:
+        return jsonify({"error": "At least one resume file is required"}), 400
+
+    candidate_ids = request.form.getlist("candidate_ids")
+    if candidate_ids and len(candidate_ids) != len(resume_files):
+        return jsonify({"error": "candidate_ids must have one entry per resume"}), 400
+
+    index = get_candidate_index()
+    indexed = []
+    errors = []
+    with admission.admit():
+        for i, resume_file in enumerate(resume_files):
+            candidate_id = candidate_ids[i] if candidate_ids else resume_file.filename
+            try:
+                with resume_upload_source(resume_file) as resume_source:
+                    if count_pages(resume_source) > MAX_RESUME_PAGES:
+                        metrics.admission_rejections.inc(reason="too_many_pages")
+                        errors.append({"candidate_id": candidate_id, "error": f"Resume has more than {MAX_RESUME_PAGES} pages"})
+                        continue
+                    resume_text, context, _ = load_resume(resume_source)
+            except Exception as exc:
+                errors.append({"candidate_id": candidate_id, "error": f"Could not analyze resume: {exc}"})
+                continue
+            index.add(candidate_id, resume_text, context, name=resume_file.filename)
+            indexed.append(candidate_id)
+
+    index.save()
+    return jsonify({"indexed": indexed, "errors": errors, "pool_size": len(index)})
+
+
+@app.route("/search", methods=["POST"])
+def search_candidates():
+    """
+    Expects:
+    - job_description (text)
+    - top_k (optional, default 10)
+
+    Returns: top_k indexed candidates with 7-factor breakdowns
+    """
+    job_description = request.form.get("job_description", "")
+
+    if job_description.strip() == "":
+        return jsonify({"error": "Job description is required"}), 400
+
+    try:
+        top_k = int(request.form.get("top_k", 10))
+    except ValueError:
+        return jsonify({"error": "top_k must be an integer"}), 400
+
+    index = get_candidate_index()
+    return jsonify({
+        "pool_size": len(index),
+        "results": index.search(job_description, top_k=max(top_k, 1)),
+    })
+
+
+@app.route("/rescore", methods=["POST"])
+def rescore_candidates():
+    """
+    Expects:
+    - job_description (text)
+    - candidate_ids (optional): indexed candidates to rescore, default all
+
+    Returns: an /analyze response per candidate (plus candidate_id and
+    name) built from the analyses stored by /index, with no resume
+    parsing; a JD whose normalized skill set is unchanged reuses each
+    candidate's skill scores
+    """
+    job_description = request.form.get("job_description", "")
+
+    if job_description.strip() == "":
+        return jsonify({"error": "Job description is required"}), 400
+
+    timer = metrics.StageTimer()
+    index = get_candidate_index()
+    with admission.admit():
+        job = prepare_job_description(job_description, timer=timer)
+        with timer.stage("rescore"):
+            results, unknown, reused = index.rescore(job, request.form.getlist("candidate_ids") or None)
+
+    for stage, seconds in timer.seconds.items():
+        metrics.stage_seconds.observe(seconds, stage=stage)
+    metrics.rescored_candidates.inc(reused, skill_scores="reused")
+    metrics.rescored_candidates.inc(len(results) - reused, skill_scores="computed")
+
+    # Not folded into the aggregates: rescoring the same pool again would count it twice
+    return jsonify({
+        "job_description_id": job["id"],
+        "pool_size": len(index),
+        "results": results,
+        "errors": [{"candidate_id": candidate_id, "error": "Unknown candidate"} for candidate_id in unknown],
+        "diagnostics": {"skill_scores_reused": reused, "stage_seconds": timer.seconds},
+    })
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Stage latency histograms, request counts, PDF sizes and cache hit rates"""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """Extraction and response cache counters for this worker"""
+    return jsonify(dict(extraction_cache.stats(), response_cache=response_cache.stats()))
+
+
+@app.route("/taxonomy", methods=["GET"])
+def taxonomy_info():
+    """Version and size of the active skill taxonomy"""
+    taxonomy = get_taxonomy()
+    return jsonify({
+        "version": taxonomy.version,
+        "skills": len(taxonomy.skill_names),
+        "match_terms": len(taxonomy.matcher.terms),
+        "roles": list(taxonomy.role_skills),
+    })
+
+
+@app.route("/taxonomy/reload", methods=["POST"])
+def taxonomy_reload():
+    """Reload the taxonomy data file now instead of waiting for the mtime check"""
+    try:
+        taxonomy = reload_taxonomy()
+    except Exception as exc:
+        return jsonify({"error": f"Taxonomy reload failed: {exc}"}), 400
+    return jsonify({"version": taxonomy.version})
+
+
+# Shared state is built before worker processes fork (gunicorn --preload, the pools below)
+if os.environ.get("WARMUP_ON_IMPORT", "").lower() in ("1", "true", "yes"):
+    warm_up()
 
 
 if __name__ == "__main__":
+    warm_up()
     app.run(host="0.0.0.0", port=5000)
 
 
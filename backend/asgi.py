@@ -0,0 +1,315 @@
+"""
+ASGI entry point: async uploads, CPU stages in the shared process pool
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+    python asgi.py
+
+/analyze is served natively here with the same request/response
+contract as app.py (form fields, limits, job mode, response cache,
+ETag / If-None-Match, 413 / 503 answers, diagnostics):
+- the upload and JD are received on the event loop, so a slow client
+  costs a coroutine rather than a worker thread for the whole transfer
+- page counting, PDF extraction, section parsing, skill extraction,
+  scoring and similarity run in app.py's batch process pool, one task
+  per resume, so they never hold the serving process's GIL
+- admission control is the same per-process limiter (admit_async), so
+  the pool is never queued deeper than the admission queue allows
+
+Every other route is the Flask app, mounted as WSGI and run on threads.
+CORS headers match app.py's flask_cors setup on every route.
+Metrics, caches and aggregates stay in the serving process, so /metrics
+and /cache/stats count every /analyze served here: the extraction cache
+is looked up before an upload goes to the pool (a hit travels with the
+task), and a worker's complete extraction comes back to be stored.
+Batch resumes and background jobs still go through their own workers'
+extraction caches, which neither endpoint counts.
+
+At startup, before the server accepts connections, the process is
+warmed up (warm_up()) and then every process pool forks its workers: a
+worker forked mid-request would share the warm-up pages no longer, and
+would inherit open client sockets, holding those connections open.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from werkzeug.http import parse_etags
+
+from admission import admission, Overloaded, MAX_RESUME_BYTES, MAX_RESUME_PAGES
+from aggregates import aggregates
+from analysis_pipeline import prepare_job_description, analyze_resume_text, extract_resume, cached_resume, extraction_cache_entry, extraction_complete
+from app import app as flask_app, get_batch_pool
+from extraction_cache import extraction_cache, hash_pdf_source
+from job_queue import get_job_queue, JOB_MAX_WAIT, JOB_POLL_INTERVAL, PENDING_STATUSES
+from metrics import StageTimer
+from pdf_extraction import count_pages, get_page_pool
+from response_cache import response_cache, response_key, etag
+from warmup import warm_up
+import metrics
+
+# flask_cors's default methods ("*" here would also allow QUERY)
+CORS_METHODS = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+
+# Threads serving the mounted Flask routes
+ASGI_WSGI_THREADS = int(os.environ.get("ASGI_WSGI_THREADS", 16))
+
+
+# === POOL TASKS ===
+
+def _page_count(pdf_bytes):
+    try:
+        return count_pages(pdf_bytes)
+    except Exception:
+        return None  # Unreadable PDFs fail in extraction, as in app.py
+
+
+def _prepare_job(pdf_bytes, job_description, max_pages):
+    """
+    Process pool entry point for job mode: page count and the prepared JD;
+    the JD is not prepared (None) if the resume is over max_pages
+    """
+    page_count = _page_count(pdf_bytes)
+    if page_count is not None and page_count > max_pages:
+        return page_count, None, {}
+    timer = StageTimer()
+    job = prepare_job_description(job_description, timer=timer)
+    return page_count, job, timer.seconds
+
+
+def _analyze_upload(pdf_bytes, job_description, cached, max_pages):
+    """
+    Process pool entry point for one /analyze upload: page-limit check,
+    extraction and scoring; stops after the page count if over max_pages
+    cached: the serving process's extraction cache entry, or None
+
+    A complete fresh extraction is returned as "cache_entry" for the
+    serving process to store; the worker keeps no cache of its own.
+    """
+    page_count = _page_count(pdf_bytes)
+    if page_count is not None and page_count > max_pages:
+        return {"page_count": page_count}
+
+    timer = StageTimer()
+    cache_entry = None
+    if cached is not None:
+        resume_text, context, extraction = cached_resume(cached)
+    else:
+        # Already running in a pool worker: parallelism is across requests, not pages
+        resume_text, context, extraction = extract_resume(pdf_bytes, workers=1, timer=timer)
+        if extraction_complete(extraction):
+            cache_entry = extraction_cache_entry(resume_text, context, extraction)
+        extraction = dict(extraction, cache="miss")
+    job = prepare_job_description(job_description, timer=timer)
+    response = analyze_resume_text(resume_text, job, context, timer=timer)
+    return {
+        "page_count": page_count,
+        "job": job,
+        "response": response,
+        "extraction": extraction,
+        "stage_seconds": timer.seconds,
+        "text_chars": len(resume_text),
+        "cache_entry": cache_entry,
+    }
+
+
+def _lookup_extraction(pdf_hash):
+    """Extraction cache lookup in the serving process; (entry or None, stage seconds)"""
+    timer = StageTimer()
+    with timer.stage("extraction_cache_lookup"):
+        cached = extraction_cache.get(pdf_hash)
+    return cached, timer.seconds
+
+
+async def _in_pool(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_batch_pool(), function, *args)
+
+
+# === RESPONSES ===
+
+def _json(payload, status_code=200, headers=None):
+    """Same body as Flask's jsonify (its JSON provider, trailing newline)"""
+    return Response(flask_app.json.dumps(payload) + "\n", status_code, headers, media_type="application/json")
+
+
+def _error(message, status_code):
+    return _json({"error": message}, status_code)
+
+
+def _too_many_pages(page_count):
+    metrics.admission_rejections.inc(reason="too_many_pages")
+    return _error(f"Resume has {page_count} pages; the limit is {MAX_RESUME_PAGES}", 413)
+
+
+def _job_response(record):
+    """200 with the finished job record, 202 while it is still pending"""
+    if record["status"] in ("done", "failed"):
+        return _json(record)
+    return _json(record, 202, {"Location": f"/jobs/{record['job_id']}"})
+
+
+async def _wait_for_job(job_queue, job_id, timeout):
+    """JobQueue.wait() without holding a thread: poll the job store"""
+    deadline = time.monotonic() + min(max(timeout, 0.0), JOB_MAX_WAIT)
+    record = job_queue.get(job_id)
+    while record is not None and record["status"] in PENDING_STATUSES and time.monotonic() < deadline:
+        await asyncio.sleep(min(JOB_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+        record = job_queue.get(job_id)
+    return record
+
+
+async def overloaded(request, exc):
+    response = _error(str(exc), 503)
+    response.headers["Retry-After"] = str(exc.retry_after)
+    return response
+
+
+# === ROUTES ===
+
+async def analyze_resume(request: Request):
+    """/analyze from app.py, with the CPU stages in the process pool"""
+    if request.method == "OPTIONS":
+        # Not a CORS preflight (CORSMiddleware answers those); Flask's automatic answer
+        return Response(headers={"Allow": "OPTIONS, POST"})
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await _analyze_resume(request)
+        status_code = response.status_code
+        return response
+    except Overloaded:
+        status_code = 503
+        raise
+    finally:
+        # Same series as the Flask route, so dashboards don't change with the server
+        metrics.requests_total.inc(endpoint="analyze_resume", status=str(status_code))
+        metrics.request_seconds.observe(time.perf_counter() - started, endpoint="analyze_resume")
+
+
+async def _analyze_resume(request):
+    # Checked on the declared length, before the upload is parsed
+    content_length = int(request.headers.get("content-length") or 0)
+    if content_length > MAX_RESUME_BYTES:
+        metrics.admission_rejections.inc(reason="too_large")
+        return _error(f"Resume upload is larger than {MAX_RESUME_BYTES} bytes", 413)
+    if content_length > flask_app.config["MAX_CONTENT_LENGTH"]:
+        metrics.admission_rejections.inc(reason="too_large")
+        return _error(f"Request body is larger than {flask_app.config['MAX_CONTENT_LENGTH']} bytes", 413)
+
+    async with request.form(max_part_size=flask_app.config["MAX_FORM_MEMORY_SIZE"]) as form:
+        resume_file = form.get("resume")
+        if resume_file is None or isinstance(resume_file, str):
+            return _error("Resume file is required", 400)
+
+        job_description = form.get("job_description", "")
+        if job_description.strip() == "":
+            return _error("Job description is required", 400)
+
+        if resume_file.size is not None and resume_file.size > MAX_RESUME_BYTES:
+            metrics.admission_rejections.inc(reason="too_large")
+            return _error(f"Resume upload is larger than {MAX_RESUME_BYTES} bytes", 413)
+
+        pdf_bytes = await resume_file.read()
+        filename = resume_file.filename
+        # Query string first, then form fields, like Flask's request.values
+        wait = request.query_params.get("wait", form.get("wait"))
+        run_async = request.query_params.get("async", form.get("async", ""))
+
+    # === JOB MODE ===
+    if wait is not None or run_async.lower() in ("1", "true", "yes"):
+        try:
+            wait_seconds = float(wait or 0)
+        except ValueError:
+            return _error("wait must be a number of seconds", 400)
+
+        page_count, job, job_stage_seconds = await _in_pool(_prepare_job, pdf_bytes, job_description, MAX_RESUME_PAGES)
+        if job is None:
+            return _too_many_pages(page_count)
+        for stage, seconds in job_stage_seconds.items():
+            metrics.stage_seconds.observe(seconds, stage=stage)
+
+        job_queue = get_job_queue()
+        job_id = job_queue.submit(pdf_bytes, job, filename=filename)
+        return _job_response(await _wait_for_job(job_queue, job_id, wait_seconds))
+
+    # === RESUME PARSING + SCORING ===
+    pdf_hash = await run_in_threadpool(hash_pdf_source, pdf_bytes)
+    cache_key = response_key(pdf_hash, job_description)
+    etag_header = f'"{etag(cache_key)}"'
+    if parse_etags(request.headers.get("if-none-match")).contains(etag(cache_key)):
+        return Response(status_code=304, headers={"ETag": etag_header})
+
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        # Served as stored; not folded into the aggregates a second time
+        return _json(dict(cached, diagnostics=dict(cached["diagnostics"], response_cache="hit")), headers={"ETag": etag_header})
+
+    # Extraction and scoring hold one admission slot (Overloaded -> 503)
+    async with admission.admit_async():
+        cached_extraction, stage_seconds = await run_in_threadpool(_lookup_extraction, pdf_hash)
+        analysis = await _in_pool(_analyze_upload, pdf_bytes, job_description, cached_extraction, MAX_RESUME_PAGES)
+    if "response" not in analysis:
+        return _too_many_pages(analysis["page_count"])
+    if analysis["cache_entry"] is not None:
+        await run_in_threadpool(extraction_cache.put, pdf_hash, analysis["cache_entry"])
+
+    response = analysis["response"]
+    stage_seconds.update(analysis["stage_seconds"])
+    response["diagnostics"] = {
+        "pdf_extraction": analysis["extraction"],
+        "stage_seconds": stage_seconds,
+    }
+    metrics.observe_analysis(stage_seconds, analysis["extraction"], analysis["text_chars"])
+    aggregates.record(analysis["job"], response)
+    # A partial analysis (timed-out pages) is neither cached nor tagged, as in app.py
+    if not extraction_complete(analysis["extraction"]):
+        return _json(dict(response, diagnostics=dict(response["diagnostics"], response_cache="miss")))
+    response_cache.put(cache_key, response)
+
+    return _json(dict(response, diagnostics=dict(response["diagnostics"], response_cache="miss")), headers={"ETag": etag_header})
+
+
+def _start_pools():
+    """Fork the workers of every process pool the routes use"""
+    for pool in (get_batch_pool(), get_page_pool()):
+        # Pools fork all their workers on first use
+        pool.submit(int).result()
+    get_job_queue().start()
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    # Runs before uvicorn opens its listening socket
+    warm_up()
+    _start_pools()
+    yield
+    get_batch_pool().shutdown(wait=False, cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        # flask_cors as configured in app.py, so /analyze answers cross-origin requests the same way: any
+        # origin, echoed back with Vary: Origin. The mounted Flask routes already get it from flask_cors
+        Route("/analyze", analyze_resume, methods=["POST", "OPTIONS"], middleware=[
+            Middleware(CORSMiddleware, allow_origin_regex=".*", allow_methods=CORS_METHODS, allow_headers=["*"], expose_headers=["ETag"]),
+        ]),
+        Mount("/", WSGIMiddleware(flask_app, workers=ASGI_WSGI_THREADS)),
+    ],
+    exception_handlers={Overloaded: overloaded},
+    lifespan=lifespan,
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -0,0 +1,200 @@
+"""
+Check that alternative serving paths answer exactly like Flask /analyze
+
+- asgi: asgi.py's native /analyze against app.py's, for the same
+  synthetic uploads: status, headers (CORS included) and body, plus the
+  CORS preflight answer. Timings in diagnostics are allowed to differ,
+  and so is Content-Length, which follows from them
+- rescore: every /rescore result against Flask /analyze for the same
+  resume and JD, without a similarity model and with a fitted one
+- search: every /search result's factors, final score, skill gaps and
+  labels against /analyze (ComprehensiveScorer.score_batch against the
+  per-candidate scorer); text similarity is the index's own and isn't
+  compared
+
+    python benchmarks/check_parity.py
+    python benchmarks/check_parity.py --resumes 20
+
+Exits with status 1 on any mismatch.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import synthetic_resume_pdf, synthetic_job_description  # noqa: E402
+
+ORIGIN = "http://localhost:3000"
+# Depend on timings only
+IGNORED_HEADERS = ("content-length",)
+PREFLIGHT_HEADERS = ("access-control-allow-origin", "access-control-allow-methods", "access-control-allow-headers")
+
+
+def _headers(headers, names=None):
+    headers = {name.lower(): value for name, value in headers.items()}
+    if names is not None:
+        return {name: headers.get(name) for name in names}
+    return {name: value for name, value in headers.items() if name not in IGNORED_HEADERS}
+
+
+def _body(payload):
+    """The response without timings; diagnostics keep their keys"""
+    payload = dict(payload)
+    if "diagnostics" in payload:
+        payload["diagnostics"] = sorted(payload["diagnostics"])
+    return payload
+
+
+def check_asgi(resumes, seed=0):
+    """Returns a list of mismatch descriptions (empty when every answer matched)"""
+    from starlette.testclient import TestClient
+
+    import app
+    import asgi
+
+    flask_client = app.app.test_client()
+    job_description = synthetic_job_description(seed=seed)
+    cases = [("resume", synthetic_resume_pdf(pages=1 + i % 3, skills=6 + i, seed=seed + i)[0], job_description)
+             for i in range(resumes)]
+    cases.append(("no job description", cases[0][1], " "))
+
+    mismatches = []
+    with TestClient(asgi.app) as asgi_client:
+        for name, pdf_bytes, jd in cases:
+            # Fresh response cache each time, so both sides compute
+            app.response_cache.clear()
+            asgi_response = asgi_client.post(
+                "/analyze", files={"resume": ("resume.pdf", pdf_bytes, "application/pdf")},
+                data={"job_description": jd}, headers={"Origin": ORIGIN},
+            )
+            app.response_cache.clear()
+            flask_response = flask_client.post(
+                "/analyze", data={"resume": (io.BytesIO(pdf_bytes), "resume.pdf"), "job_description": jd},
+                headers={"Origin": ORIGIN},
+            )
+            if asgi_response.status_code != flask_response.status_code:
+                mismatches.append(f"{name}: status {asgi_response.status_code} != {flask_response.status_code}")
+            if _headers(asgi_response.headers) != _headers(flask_response.headers):
+                mismatches.append(f"{name}: headers {_headers(asgi_response.headers)} != {_headers(flask_response.headers)}")
+            if _body(asgi_response.json()) != _body(flask_response.json):
+                mismatches.append(f"{name}: bodies differ")
+
+        preflight = {"Origin": ORIGIN, "Access-Control-Request-Method": "POST", "Access-Control-Request-Headers": "content-type"}
+        asgi_preflight = _headers(asgi_client.options("/analyze", headers=preflight).headers, PREFLIGHT_HEADERS)
+        flask_preflight = _headers(flask_client.options("/analyze", headers=preflight).headers, PREFLIGHT_HEADERS)
+        if asgi_preflight != flask_preflight:
+            mismatches.append(f"preflight: {asgi_preflight} != {flask_preflight}")
+    return mismatches
+
+
+# /search result fields that /analyze answers identically
+SEARCH_FIELDS = ("score_breakdown_7_factor", "experience_level", "match_classification")
+SEARCH_SKILL_FIELDS = ("matched_skills", "missing_skills", "critical_missing_skills")
+
+
+def _index_pool(flask_client, pdfs):
+    """A fresh candidate index holding pdfs as resume<i>.pdf"""
+    import candidate_index
+
+    candidate_index._index = candidate_index.CandidateIndex()
+    flask_client.post("/index", data={
+        "resumes": [(io.BytesIO(pdf_bytes), f"resume{i}.pdf") for i, pdf_bytes in enumerate(pdfs)],
+    })
+
+
+def _analyze(flask_client, pdfs, candidate_id, jd):
+    import app
+
+    app.response_cache.clear()
+    pdf_bytes = pdfs[int(candidate_id[len("resume"):-len(".pdf")])]
+    analyzed = flask_client.post(
+        "/analyze", data={"resume": (io.BytesIO(pdf_bytes), "resume.pdf"), "job_description": jd},
+    ).json
+    analyzed.pop("diagnostics")
+    return analyzed
+
+
+def check_search(resumes, seed=0):
+    """Returns a list of mismatch descriptions (empty when every answer matched)"""
+    import app
+    import candidate_index
+
+    flask_client = app.app.test_client()
+    pdfs = [synthetic_resume_pdf(pages=1 + i % 3, skills=2 + 3 * i, seed=seed + i)[0] for i in range(resumes)]
+    job_descriptions = [synthetic_job_description(skills=3 + 2 * i, seed=seed + i) for i in range(4)]
+
+    mismatches = []
+    with tempfile.TemporaryDirectory() as directory:
+        # Never touch the real index
+        candidate_index.CANDIDATE_INDEX_PATH = os.path.join(directory, "candidate_index.joblib")
+        _index_pool(flask_client, pdfs)
+        for jd in job_descriptions:
+            results = flask_client.post("/search", data={"job_description": jd, "top_k": resumes}).json["results"]
+            if len(results) != resumes:
+                mismatches.append(f"{len(results)} of {resumes} candidates ranked")
+            for result in results:
+                analyzed = _analyze(flask_client, pdfs, result["candidate_id"], jd)
+                differing = [field for field in SEARCH_FIELDS if result[field] != analyzed[field]]
+                differing += [field for field in SEARCH_SKILL_FIELDS if sorted(result[field]) != sorted(analyzed[field])]
+                if result["scoring_breakdown"]["final_score"] != analyzed["scoring_breakdown"]["final_score"]:
+                    differing.append("final_score")
+                if differing:
+                    mismatches.append(f"{result['candidate_id']}: {differing} differ")
+    return mismatches
+
+
+def check_rescore(resumes, seed=0):
+    """Returns a list of mismatch descriptions (empty when every answer matched)"""
+    import app
+    import candidate_index
+    import similarity
+    from synthetic import synthetic_resume
+
+    flask_client = app.app.test_client()
+    pdfs = [synthetic_resume_pdf(pages=1 + i % 3, skills=6 + i, seed=seed + i)[0] for i in range(resumes)]
+    job_descriptions = [synthetic_job_description(skills=4 + i, seed=seed + i) for i in range(3)]
+    corpus = [synthetic_resume(skills=10, seed=seed + 1000 + i) for i in range(50)] + job_descriptions
+
+    mismatches = []
+    with tempfile.TemporaryDirectory() as directory:
+        # Never touch the real index
+        candidate_index.CANDIDATE_INDEX_PATH = os.path.join(directory, "candidate_index.joblib")
+        for model_name, model in (("no model", None), ("fitted model", similarity.SimilarityModel.fit(corpus))):
+            similarity._model, similarity._model_loaded = model, True
+            _index_pool(flask_client, pdfs)
+
+            for jd in job_descriptions:
+                # Twice: computed, then reusing the memoized skill scores
+                for attempt in ("computed", "reused"):
+                    results = flask_client.post("/rescore", data={"job_description": jd}).json["results"]
+                    for result in results:
+                        analyzed = _analyze(flask_client, pdfs, result["candidate_id"], jd)
+                        rescored = {key: value for key, value in result.items() if key not in ("candidate_id", "name")}
+                        if rescored != analyzed:
+                            differing = sorted(key for key in analyzed if rescored.get(key) != analyzed[key])
+                            mismatches.append(f"{model_name}, {result['candidate_id']} ({attempt}): {differing} differ")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check serving paths against Flask /analyze")
+    parser.add_argument("--resumes", type=int, default=5, help="Synthetic resumes per check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, check in (("asgi", check_asgi), ("search", check_search), ("rescore", check_rescore)):
+        mismatches = check(args.resumes, args.seed)
+        for mismatch in mismatches:
+            print(f"{name}: {mismatch}")
+        print(f"{name}: {'OK' if not mismatches else f'{len(mismatches)} mismatches'}")
+        failed = failed or bool(mismatches)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Benchmark every stage of the /analyze pipeline
+
+Runs a matrix of synthetic cases (resume pages x resume skills x taxonomy
+size), times each stage of analyze_resume individually plus the whole
+pipeline end to end, and reports mean, p50/p95/p99 and throughput.
+
+Results are written as JSON so a later run can be compared against them:
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+
+--compare exits with status 1 when any stage's p50 regressed by more
+than --threshold (default 1.25x).
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_context import AnalysisContext  # noqa: E402
+from analysis_pipeline import prepare_job_description, analyze_resume_text  # noqa: E402
+from comprehensive_scorer import ComprehensiveScorer  # noqa: E402
+from gap_analyzer import skill_gap_masks, generate_comprehensive_suggestions  # noqa: E402
+from pdf_extraction import extract_pdf, PDF_PARALLEL_MIN_PAGES  # noqa: E402
+from resume_parser import extract_experience_level, detect_domain_context  # noqa: E402
+from similarity import calculate_similarity  # noqa: E402
+from skill_extractor import extract_skills, detect_job_role  # noqa: E402
+from taxonomy import get_taxonomy, set_taxonomy, reload_taxonomy  # noqa: E402
+from synthetic import synthetic_taxonomy, synthetic_resume_pdf, synthetic_job_description  # noqa: E402
+
+PAGES = [1, 3, 10]
+RESUME_SKILLS = [10, 40]
+TAXONOMY_SIZES = [0, 1000, 5000]  # extra synthetic skills on top of the shipped taxonomy
+JD_SKILLS = 10
+
+QUICK_CASES = [(1, 10, 0), (3, 40, 1000), (10, 40, 5000)]
+
+
+@contextmanager
+def timed(timings, stage):
+    started = time.perf_counter()
+    yield
+    timings[stage].append(time.perf_counter() - started)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    mean = sum(ordered) / len(ordered)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(mean * 1000, 4),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 4),
+        "throughput_per_s": round(1 / mean, 2) if mean else None,
+    }
+
+
+def run_case(pages, resume_skills, extra_skills, iterations, seed):
+    """Time every stage for `iterations` synthetic resumes of one shape"""
+    taxonomy = synthetic_taxonomy(extra_skills, seed=seed) if extra_skills else get_taxonomy()
+    set_taxonomy(taxonomy)
+
+    job_description = synthetic_job_description(skills=JD_SKILLS, seed=seed, taxonomy=taxonomy)
+    documents = [
+        synthetic_resume_pdf(pages=pages, skills=resume_skills, seed=seed + i, taxonomy=taxonomy)[0]
+        for i in range(iterations)
+    ]
+    timings = defaultdict(list)
+
+    for pdf_bytes in documents:
+        # === STAGES, individually ===
+        with timed(timings, "pdf_extraction"):
+            resume_text = extract_pdf(pdf_bytes, workers=1)["text"]
+        if pages >= PDF_PARALLEL_MIN_PAGES:
+            with timed(timings, "pdf_extraction_parallel"):
+                extract_pdf(pdf_bytes)
+        with timed(timings, "analysis_context"):
+            context = AnalysisContext(resume_text)
+            context.section_spans
+        with timed(timings, "extract_skills"):
+            resume_skills_found = extract_skills(context)
+        with timed(timings, "extract_experience_level"):
+            experience_level = extract_experience_level(context)
+        with timed(timings, "job_analysis"):
+            jd_skills = extract_skills(job_description)
+            detected_role = detect_job_role(jd_skills)
+        with timed(timings, "gap_analysis"):
+            gap = skill_gap_masks(
+                taxonomy.mask(resume_skills_found), taxonomy.mask(jd_skills), taxonomy.core_masks.get(detected_role, 0)
+            )
+            matched_skills = taxonomy.skills_from_mask(gap["matched"])
+            missing_skills = taxonomy.skills_from_mask(gap["missing"])
+            bonus_skills = taxonomy.skills_from_mask(gap["bonus"])
+            critical_missing_skills = taxonomy.skills_from_mask(gap["critical_missing"])
+
+        scorer = ComprehensiveScorer(detected_role, experience_level)
+        factor_scores = {}
+        with timed(timings, "factor_1_required_skills"):
+            factor_scores["required_skills"] = scorer.score_factor_1_required_skills(matched_skills, jd_skills, missing_skills)
+        with timed(timings, "factor_2_skill_relevance"):
+            factor_scores["skill_relevance"] = scorer.score_factor_2_skill_relevance(resume_skills_found, jd_skills)
+        with timed(timings, "factor_3_skill_depth"):
+            factor_scores["skill_depth"] = scorer.score_factor_3_skill_depth(context, matched_skills)
+        with timed(timings, "factor_4_experience_alignment"):
+            factor_scores["experience_alignment"] = scorer.score_factor_4_experience_alignment(len(missing_skills), len(jd_skills))
+        with timed(timings, "factor_5_domain_context"):
+            factor_scores["domain_context"] = scorer.score_factor_5_domain_context(detect_domain_context(context, job_description))
+        with timed(timings, "factor_6_ats_optimization"):
+            factor_scores["ats_optimization"] = scorer.score_factor_6_ats_optimization(context)
+        with timed(timings, "factor_7_signal_noise"):
+            factor_scores["signal_noise"] = scorer.score_factor_7_signal_noise_ratio(bonus_skills, missing_skills)
+        final_score = scorer.calculate_weighted_score(factor_scores)
+
+        with timed(timings, "similarity"):
+            calculate_similarity(resume_text, job_description)
+        with timed(timings, "suggestions"):
+            generate_comprehensive_suggestions(
+                missing_skills, resume_skills_found, bonus_skills, final_score,
+                len(matched_skills), len(jd_skills),
+                detected_role=detected_role, critical_missing_skills=critical_missing_skills,
+            )
+
+        # === END TO END (no extraction cache) ===
+        with timed(timings, "end_to_end"):
+            text = extract_pdf(pdf_bytes)["text"]
+            analyze_resume_text(text, prepare_job_description(job_description))
+
+    return {stage: summarize(samples) for stage, samples in timings.items()}
+
+
+def compare(results, baseline, threshold):
+    """Print p50 ratios against a baseline; return the regressed (case, stage) pairs"""
+    regressions = []
+    for case, stages in results.items():
+        base_stages = baseline.get("results", {}).get(case)
+        if not base_stages:
+            continue
+        for stage, summary in stages.items():
+            base = base_stages.get(stage)
+            if not base or not base["p50_ms"]:
+                continue
+            ratio = summary["p50_ms"] / base["p50_ms"]
+            flag = "REGRESSION" if ratio > threshold else ""
+            print(f"  {case:32} {stage:32} {base['p50_ms']:>10.3f} -> {summary['p50_ms']:>10.3f} ms  x{ratio:5.2f} {flag}")
+            if ratio > threshold:
+                regressions.append((case, stage))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline")
+    parser.add_argument("--iterations", type=int, default=20, help="Resumes per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="Run a 3-case subset")
+    parser.add_argument("--save", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Compare p50s against a saved results JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="p50 ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    cases = QUICK_CASES if args.quick else list(itertools.product(PAGES, RESUME_SKILLS, TAXONOMY_SIZES))
+    iterations = min(args.iterations, 5) if args.quick else args.iterations
+
+    results = {}
+    try:
+        for pages, resume_skills, extra_skills in cases:
+            case = f"pages={pages},skills={resume_skills},taxonomy=+{extra_skills}"
+            results[case] = run_case(pages, resume_skills, extra_skills, iterations, args.seed)
+            end_to_end = results[case]["end_to_end"]
+            print(f"{case:32} end_to_end p50 {end_to_end['p50_ms']:9.2f} ms  p99 {end_to_end['p99_ms']:9.2f} ms  {end_to_end['throughput_per_s']} docs/s")
+    finally:
+        reload_taxonomy()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "iterations": iterations,
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as out_file:
+            json.dump(report, out_file, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as base_file:
+            baseline = json.load(base_file)
+        print(f"Comparing p50 against {args.compare}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} stage(s) regressed beyond x{args.threshold}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Deterministic synthetic resumes, job descriptions and taxonomies
+
+Everything is driven by a seeded random.Random, so the same arguments
+always produce the same documents (and the same PDF bytes). PDFs are
+written with a minimal built-in writer (Helvetica text, one content
+stream per page) so no PDF-generation dependency is needed.
+"""
+
+import random
+
+from taxonomy import Taxonomy, get_taxonomy
+
+LINES_PER_PAGE = 48
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Riley", "Casey", "Avery"]
+LAST_NAMES = ["Lee", "Patel", "Garcia", "Kim", "Nguyen", "Smith", "Okafor", "Rossi"]
+
+ACTION_VERBS = [
+    "Built", "Developed", "Implemented", "Designed", "Deployed", "Managed",
+    "Optimized", "Led", "Created", "Maintained", "Tested", "Architected",
+]
+
+FILLER = [
+    "a customer-facing platform", "internal tooling", "the reporting pipeline",
+    "a high-traffic service", "an onboarding workflow", "the billing system",
+    "a data ingestion job", "microservices", "a mobile companion app",
+    "the analytics dashboard", "integration tests", "a recommendation engine",
+]
+
+OUTCOMES = [
+    "reducing latency by 30%", "serving 2M requests per day", "cutting costs by 15%",
+    "improving test coverage to 90%", "for 40k monthly users", "ahead of schedule",
+]
+
+
+def synthetic_taxonomy(extra_skills, seed=0):
+    """The active taxonomy plus extra_skills generated skill names"""
+    rng = random.Random(seed)
+    base = get_taxonomy()
+    syllables = ["ka", "lo", "mi", "ra", "zen", "tor", "vex", "qua", "dri", "nol", "sy", "pha"]
+    generated = set()
+    while len(generated) < extra_skills:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.3:
+            name += " " + rng.choice(["db", "js", "ml", "ops", "cloud", "api"])
+        generated.add(name)
+
+    data = {
+        "skills": list(base.skills) + sorted(generated),
+        "synonyms": dict(base.synonyms),
+        "spelling_variants": list(base.spelling_variants),
+        "roles": {role: list(skills) for role, skills in base.role_skills.items()},
+        "scored_roles": list(base.scored_roles),
+        "core_skills_by_role": {role: list(skills) for role, skills in base.core_skills_by_role.items()},
+        "skill_categories": {name: list(skills) for name, skills in base.skill_categories.items()},
+        "secondary_skills": sorted(base.secondary_skills),
+        "skill_actions": dict(base.skill_actions),
+    }
+    return Taxonomy(data, version=f"synthetic-{len(data['skills'])}-{seed}")
+
+
+def _skill_pool(taxonomy):
+    return sorted(set(taxonomy.skills))
+
+
+def synthetic_resume(pages=1, skills=12, seed=0, taxonomy=None):
+    """Resume text of roughly `pages` pages mentioning `skills` taxonomy skills"""
+    rng = random.Random(seed)
+    pool = _skill_pool(taxonomy or get_taxonomy())
+    chosen = rng.sample(pool, min(skills, len(pool)))
+
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"email: candidate{seed}@example.com | https://github.com/candidate{seed}",
+        "",
+        "TECHNICAL SKILLS",
+        ", ".join(chosen),
+        "",
+        "EXPERIENCE",
+    ]
+    target = pages * LINES_PER_PAGE
+    section_cycle = ["EXPERIENCE", "PROJECTS"]
+    line_no = 0
+    while len(lines) < target - 4:
+        line_no += 1
+        if line_no % 12 == 0:
+            lines.append("")
+            lines.append(section_cycle[(line_no // 12) % 2])
+            continue
+        if line_no % 12 == 1:
+            years = rng.randint(1, 9)
+            lines.append(f"Software Engineer, Company {rng.randint(1, 99)} ({years} years)")
+            continue
+        lines.append(
+            f"- {rng.choice(ACTION_VERBS)} {rng.choice(FILLER)} with "
+            f"{rng.choice(chosen)} and {rng.choice(chosen)}, {rng.choice(OUTCOMES)}"
+        )
+    lines += ["", "EDUCATION", "B.Sc. Computer Science, State University"]
+    return "\n".join(lines)
+
+
+def synthetic_job_description(skills=8, seed=0, taxonomy=None):
+    """Job description text requiring `skills` taxonomy skills"""
+    rng = random.Random(seed + 10_000)
+    pool = _skill_pool(taxonomy or get_taxonomy())
+    required = rng.sample(pool, min(skills, len(pool)))
+    paragraphs = [
+        "We are hiring a software engineer to join our platform team.",
+        "Requirements: " + ", ".join(required) + ".",
+        "You will design, build and deploy services, work with data pipelines "
+        "and collaborate with frontend and backend engineers.",
+        "Nice to have: experience with cloud infrastructure and CI/CD.",
+    ]
+    return "\n\n".join(paragraphs)
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text, lines_per_page=LINES_PER_PAGE):
+    """Minimal PDF (Helvetica, latin-1) with lines_per_page lines per page"""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>", b""]
+    font_id, pages_id = 1, 2
+    kids = []
+    for page_lines in pages:
+        shown = b" ".join(
+            b"(" + _pdf_escape(line).encode("latin-1", "replace") + b") '"
+            for line in page_lines
+        )
+        stream = b"BT /F1 10 Tf 50 790 Td 15 TL " + shown + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content_id, font_id)
+        )
+        kids.append(len(objects))
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    catalog_id = len(objects)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref
+    )
+    return bytes(out)
+
+
+def synthetic_resume_pdf(pages=1, skills=12, seed=0, taxonomy=None):
+    """(pdf_bytes, text) for a synthetic resume"""
+    text = synthetic_resume(pages=pages, skills=skills, seed=seed, taxonomy=taxonomy)
+    return make_pdf(text), text
@@ -0,0 +1,306 @@
+"""
+Offline bulk analysis of resume PDFs
+
+Scores a directory (or manifest) of PDFs against one or more job
+descriptions without going through the HTTP server:
+    python bulk_analyze.py resumes/ --jd backend.txt --jd data.txt -o scores.jsonl
+    python bulk_analyze.py manifest.txt --jd backend.txt -o scores/ --format parquet
+
+- inputs: directories (searched recursively for *.pdf), PDF files, or
+  manifest files listing one PDF path per line (relative paths are
+  resolved against the manifest's directory, # starts a comment)
+- each JD is prepared once in the parent process and shipped to every
+  worker once, at pool start
+- PDFs are handed out in chunks of --chunk-size; each PDF is extracted
+  once and scored against every JD
+- jsonl output: one line per (PDF, JD) pair, the /analyze response
+  plus source and job_description_name (or error)
+- parquet output (requires pyarrow): a directory of part files with key
+  columns and the full response as a JSON string column
+
+The output doubles as the checkpoint: an interrupted run started again
+with the same arguments skips every (PDF, JD) pair already written.
+Progress and docs/s go to stderr.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from analysis_context import AnalysisContext
+from analysis_pipeline import prepare_job_description, analyze_resume_text
+from pdf_extraction import extract_pdf
+from warmup import warm_up
+
+BULK_CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE", 8))
+BULK_PROGRESS_INTERVAL = 10.0
+
+PARQUET_COLUMNS = (
+    "source", "job_description_id", "job_description_name",
+    "final_score", "match_classification", "detected_role", "error", "result",
+)
+
+_worker_jobs = None
+
+
+# === INPUTS ===
+
+def iter_pdf_paths(inputs):
+    """PDF paths from directories, PDF files and manifests, in a stable order"""
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, dirs, files in os.walk(entry):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".pdf"):
+                        yield os.path.join(root, name)
+        elif entry.lower().endswith(".pdf"):
+            yield entry
+        else:
+            base_dir = os.path.dirname(entry)
+            with open(entry, "r", encoding="utf-8") as manifest:
+                for line in manifest:
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        yield os.path.join(base_dir, line)
+
+
+def load_job_descriptions(paths):
+    """(name, prepared job) per JD text file; the name is the file name"""
+    jobs = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as jd_file:
+            jobs.append((os.path.basename(path), prepare_job_description(jd_file.read())))
+    return jobs
+
+
+# === WORKERS ===
+
+def _init_worker(jobs):
+    global _worker_jobs
+    _worker_jobs = jobs
+
+
+def analyze_chunk(paths, jobs=None):
+    """
+    Extract each PDF once and score it against every job description
+    Returns the output records for the chunk
+    """
+    jobs = _worker_jobs if jobs is None else jobs
+    records = []
+    for path in paths:
+        try:
+            # Parallelism is across documents here; every PDF is read once, so skip the extraction cache
+            extraction = extract_pdf(path, workers=1)
+            resume_text = extraction.pop("text")
+            context = AnalysisContext(resume_text)
+        except Exception as exc:
+            records.extend(
+                {"source": path, "job_description_id": job["id"], "job_description_name": name,
+                 "error": f"Could not analyze resume: {exc}"}
+                for name, job in jobs
+            )
+            continue
+
+        for name, job in jobs:
+            try:
+                result = analyze_resume_text(resume_text, job, context)
+            except Exception as exc:
+                records.append({"source": path, "job_description_id": job["id"], "job_description_name": name,
+                                "error": f"Could not analyze resume: {exc}"})
+                continue
+            result["diagnostics"] = {"pdf_extraction": extraction, "text_chars": len(resume_text)}
+            records.append(dict(result, source=path, job_description_name=name))
+    return records
+
+
+# === OUTPUT ===
+
+class JsonlWriter:
+    """Appends records to one JSONL file, flushed after every chunk"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def completed(self):
+        """(source, job_description_id) pairs already written"""
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "rb+") as out_file:
+            valid_bytes = 0
+            for line in out_file:
+                if not line.endswith(b"\n"):
+                    break  # Partial line from an interrupted run
+                record = json.loads(line)
+                done.add((record["source"], record["job_description_id"]))
+                valid_bytes += len(line)
+            out_file.truncate(valid_bytes)
+        return done
+
+    def __enter__(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def write(self, records):
+        self._file.writelines(json.dumps(record) + "\n" for record in records)
+        self._file.flush()
+
+    def __exit__(self, *exc_info):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes each chunk as its own part file in a directory (renamed into place once complete)"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._run = uuid.uuid4().hex[:8]
+        self._parts = 0
+
+    def completed(self):
+        done = set()
+        if not os.path.isdir(self.path):
+            return done
+        for name in os.listdir(self.path):
+            if name.endswith(".parquet"):
+                table = self._pq.read_table(os.path.join(self.path, name), columns=["source", "job_description_id"])
+                done.update(zip(table.column("source").to_pylist(), table.column("job_description_id").to_pylist()))
+        return done
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        return self
+
+    def write(self, records):
+        if not records:
+            return
+        rows = {column: [] for column in PARQUET_COLUMNS}
+        for record in records:
+            breakdown = record.get("scoring_breakdown", {})
+            rows["source"].append(record["source"])
+            rows["job_description_id"].append(record["job_description_id"])
+            rows["job_description_name"].append(record["job_description_name"])
+            rows["final_score"].append(breakdown.get("final_score"))
+            rows["match_classification"].append(record.get("match_classification"))
+            rows["detected_role"].append(record.get("detected_role"))
+            rows["error"].append(record.get("error"))
+            rows["result"].append(None if "error" in record else json.dumps(record))
+        table = self._pa.table(rows)
+        part_path = os.path.join(self.path, f"part-{self._run}-{self._parts:05d}.parquet")
+        self._pq.write_table(table, part_path + ".tmp")
+        os.replace(part_path + ".tmp", part_path)
+        self._parts += 1
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+# === DRIVER ===
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def run(paths, jobs, writer, workers=None, chunk_size=None, progress=sys.stderr):
+    """
+    Analyze every PDF in paths against every prepared job, skipping pairs
+    the writer already holds; returns a summary dict
+    """
+    chunk_size = chunk_size or BULK_CHUNK_SIZE
+    workers = workers or os.cpu_count() or 1
+    done = writer.completed()
+    job_ids = [job["id"] for _, job in jobs]
+    # A PDF missing any of its pairs is re-scored against every JD; pairs already written are dropped
+    pending = [path for path in paths if any((path, job_id) not in done for job_id in job_ids)]
+    skipped = len(paths) - len(pending)
+
+    summary = {"documents": 0, "records": 0, "errors": 0, "skipped_documents": skipped}
+    started = time.perf_counter()
+    last_report = started
+
+    def report(final=False):
+        elapsed = time.perf_counter() - started
+        rate = summary["documents"] / elapsed if elapsed else 0.0
+        label = "done" if final else "progress"
+        print(f"[{label}] {summary['documents']}/{len(pending)} docs, {summary['records']} records, "
+              f"{summary['errors']} errors, {elapsed:.1f}s, {rate:.2f} docs/s", file=progress)
+
+    with writer, ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(jobs,)) as pool:
+        chunks = _chunks(pending, chunk_size)
+        in_flight = {}
+
+        def submit_next():
+            for chunk in chunks:
+                in_flight[pool.submit(analyze_chunk, chunk)] = chunk
+                return
+
+        # Two chunks per worker keep the pool busy without queueing the whole run
+        for _ in range(workers * 2):
+            submit_next()
+        try:
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk = in_flight.pop(future)
+                    records = [record for record in future.result()
+                               if (record["source"], record["job_description_id"]) not in done]
+                    writer.write(records)
+                    summary["documents"] += len(chunk)
+                    summary["records"] += len(records)
+                    summary["errors"] += sum("error" in record for record in records)
+                    submit_next()
+                if time.perf_counter() - last_report >= BULK_PROGRESS_INTERVAL:
+                    last_report = time.perf_counter()
+                    report()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    summary["docs_per_second"] = round(summary["documents"] / summary["seconds"], 2) if summary["seconds"] else None
+    report(final=True)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score resume PDFs against job descriptions in bulk")
+    parser.add_argument("inputs", nargs="+", help="PDF directories, PDF files or manifest files")
+    parser.add_argument("--jd", action="append", required=True, help="Job description text file (repeatable)")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file, or directory for parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), help="Default: parquet if --output ends in .parquet or is a directory, else jsonl")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE, help="PDFs per work item")
+    args = parser.parse_args(argv)
+
+    output_format = args.format
+    if output_format is None:
+        is_parquet = args.output.endswith(".parquet") or os.path.isdir(args.output)
+        output_format = "parquet" if is_parquet else "jsonl"
+    writer = ParquetWriter(args.output) if output_format == "parquet" else JsonlWriter(args.output)
+
+    paths = list(dict.fromkeys(iter_pdf_paths(args.inputs)))
+    # Workers fork from this process: build shared state once, here
+    warm_up()
+    jobs = load_job_descriptions(args.jd)
+    print(f"{len(paths)} PDFs x {len(jobs)} job descriptions -> {args.output} ({output_format})", file=sys.stderr)
+
+    summary = run(paths, jobs, writer, workers=args.workers, chunk_size=args.chunk_size)
+    print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
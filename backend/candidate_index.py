@@ -0,0 +1,401 @@
+"""
+Candidate pool index
+
+Every resume is analyzed once at ingest time: text, sections, normalized
+skills, per-skill depth credit, experience level, domain profile, ATS
+features and similarity features are stored with the candidate.
+Ranking a job description against the pool then needs no PDF parsing:
+- inverted index skill -> candidates shortlists who matches any JD skill
+- a uint64 bitset matrix (one row of Taxonomy.mask() words per
+  candidate) gives match and core-match counts for the whole shortlist
+  as a vectorized AND plus popcount over the words the JD touches
+- a sparse depth matrix gives depth totals in one sparse product
+- a dense domain-profile matrix gives factor 5 for the whole shortlist
+  in one vectorized pass against the JD profile
+- ComprehensiveScorer.score_batch scores the shortlist in one shot
+- a sparse document matrix gives every text similarity in one product;
+  it is weighed with the similarity model's IDF at compile time, so
+  with the index's own hashing model (whose IDF grows with every
+  ingest) a score doesn't depend on when the candidate was added
+
+rescore() turns stored analyses back into full /analyze responses for a
+changed JD without touching the resumes: only the JD-dependent parts are
+recomputed, and the skill-dependent half (gaps, factors 1-4 and 7) is
+memoized per candidate and JD skill set, so a JD edit that leaves its
+normalized skills alone costs a lookup plus factor 5, similarity and
+suggestions per candidate. Text similarity is /analyze's: the stored
+features when the index shares the process's similarity model,
+calculate_similarity() on the stored text otherwise.
+
+The compiled matrices are tied to the taxonomy version (skill IDs change
+on reload) and are rebuilt lazily after ingests or a taxonomy swap.
+NumPy, SciPy and joblib are imported on first use.
+"""
+
+import os
+import threading
+from collections import OrderedDict, defaultdict
+
+from comprehensive_scorer import ComprehensiveScorer
+from gap_analyzer import classify_match, skill_gap_masks
+from analysis_context import AnalysisContext
+from analysis_pipeline import job_skill_mask, score_skills, score_response
+from resume_parser import DOMAIN_NAMES, extract_experience_level, domain_profile, domain_relevance
+from similarity import HashingSimilarityModel, calculate_similarity, get_similarity_model
+from skill_extractor import extract_skills, detect_job_role
+from taxonomy import get_taxonomy
+
+CANDIDATE_INDEX_PATH = os.environ.get("CANDIDATE_INDEX_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "candidate_index.joblib")
+
+# (candidate, JD skill set) pairs whose skill scores rescore() keeps
+RESCORE_CACHE_SIZE = int(os.environ.get("RESCORE_CACHE_SIZE", 20000))
+
+
+class CandidateIndex:
+    """In-memory candidate pool with skill postings and sparse matrices"""
+
+    def __init__(self, similarity_model=None):
+        # Without a fitted model the index owns a hashing model it keeps updating
+        self.similarity_model = similarity_model or get_similarity_model() or HashingSimilarityModel()
+        self.records = []       # row -> candidate record (None once replaced)
+        self.positions = {}     # candidate_id -> row
+        self.skill_postings = defaultdict(set)
+        self._lock = threading.RLock()
+        self._compiled = None
+        # (candidate_id, taxonomy version, JD skill mask) -> (record, score_skills() result)
+        self._skill_scores = OrderedDict()
+
+    def __len__(self):
+        return len(self.positions)
+
+    # === INGEST ===
+
+    def add(self, candidate_id, resume_text, context=None, name=None):
+        """Analyze a resume once and store it (replaces an existing candidate_id)"""
+        if context is None:
+            context = AnalysisContext(resume_text)
+        resume_skills = extract_skills(context)
+
+        # Unweighted: the IDF is applied when documents are compared (see _compile)
+        features = self.similarity_model.features([resume_text])
+        if isinstance(self.similarity_model, HashingSimilarityModel):
+            self.similarity_model.partial_fit_features(features)
+
+        record = {
+            "id": candidate_id,
+            "name": name or candidate_id,
+            "text": resume_text,
+            "sections": context.sections,
+            "skills": resume_skills,
+            # Per-skill factor 3 credit, summed over whichever skills a JD matches
+            "depth": [ComprehensiveScorer.skill_depth_points(context, [skill]) for skill in resume_skills],
+            "experience_level": extract_experience_level(context),
+            "domain_profile": domain_profile(context),
+            "ats": ComprehensiveScorer.ats_features(context),
+            "features": features,
+        }
+
+        with self._lock:
+            self.remove(candidate_id)
+            row = len(self.records)
+            self.records.append(record)
+            self.positions[candidate_id] = row
+            for skill in resume_skills:
+                self.skill_postings[skill].add(row)
+            self._compiled = None
+        return record
+
+    def remove(self, candidate_id):
+        """Drop a candidate; its row is left as a tombstone"""
+        with self._lock:
+            row = self.positions.pop(candidate_id, None)
+            if row is None:
+                return False
+            for skill in self.records[row]["skills"]:
+                self.skill_postings[skill].discard(row)
+            self.records[row] = None
+            self._compiled = None
+            return True
+
+    # === COMPILED MATRICES ===
+
+    def _compile(self):
+        import numpy as np
+        import scipy.sparse as sp
+
+        taxonomy = get_taxonomy()
+        compiled = self._compiled
+        if compiled is not None and compiled["taxonomy_version"] == taxonomy.version:
+            return compiled
+
+        with self._lock:
+            n_rows = len(self.records)
+            n_skills = len(taxonomy.skill_names)
+            n_words = _word_count(taxonomy)
+            rows, cols, depth = [], [], []
+            skill_bits = []
+            levels = np.full(n_rows, "junior", dtype=object)
+            domain_profiles = np.zeros((n_rows, len(DOMAIN_NAMES)))
+            ats = np.zeros((n_rows, 4))
+            vectors = []
+
+            for row, record in enumerate(self.records):
+                if record is None:
+                    skill_bits.append(bytes(n_words * 8))
+                    vectors.append(sp.csr_matrix((1, self._feature_width())))
+                    continue
+                for skill, points in zip(record["skills"], record["depth"]):
+                    skill_id = taxonomy.skill_id(skill)
+                    if skill_id is not None:
+                        rows.append(row)
+                        cols.append(skill_id)
+                        depth.append(points)
+                skill_bits.append(taxonomy.mask(record["skills"]).to_bytes(n_words * 8, "little"))
+                levels[row] = record["experience_level"]
+                domain_profiles[row] = record["domain_profile"]
+                ats[row] = record["ats"]
+                vectors.append(record["features"])
+
+            skill_bits = np.frombuffer(b"".join(skill_bits), dtype="<u8").reshape(n_rows, n_words)
+            compiled = {
+                "taxonomy_version": taxonomy.version,
+                "skill_bits": skill_bits,
+                "skill_counts": np.bitwise_count(skill_bits).sum(axis=1),
+                "depth": sp.csr_matrix((depth, (rows, cols)), shape=(n_rows, n_skills)),
+                "levels": levels,
+                "domain_profiles": domain_profiles,
+                "ats": ats,
+                # Current IDF; ingests reset the compiled state, so it is never stale
+                "documents": self.similarity_model.weigh(sp.vstack(vectors).tocsr()) if vectors else None,
+            }
+            self._compiled = compiled
+            return compiled
+
+    def _feature_width(self):
+        for record in self.records:
+            if record is not None:
+                return record["features"].shape[1]
+        return 0
+
+    # === SEARCH ===
+
+    def search(self, job_description, top_k=10):
+        """
+        Rank the pool against a job description
+        Returns the top_k candidates with their 7-factor breakdowns
+        """
+        import numpy as np
+
+        taxonomy = get_taxonomy()
+        jd_skills = extract_skills(job_description)
+        detected_role = detect_job_role(jd_skills)
+        jd_domain_profile = np.asarray(domain_profile(job_description.lower()), dtype=np.float64)
+
+        with self._lock:
+            compiled = self._compile()
+            records = list(self.records)
+            # Shortlist: candidates matching at least one JD skill, or everyone
+            # when that leaves fewer than top_k
+            shortlist = set().union(*(self.skill_postings.get(skill, ()) for skill in jd_skills))
+
+        if len(shortlist) < top_k:
+            shortlist = {row for row, record in enumerate(records) if record is not None}
+        if not shortlist:
+            return []
+        rows = np.fromiter(sorted(shortlist), dtype=np.int64)
+
+        jd_mask = taxonomy.mask(jd_skills)
+        role_core_mask = taxonomy.core_masks.get(detected_role, 0)
+        jd_words = _mask_words(jd_mask, taxonomy)
+        core_words = _mask_words(jd_mask & role_core_mask, taxonomy)
+
+        # Only the words holding JD bits can match; bonus follows from the row's popcount
+        words = np.flatnonzero(jd_words)
+        bits = compiled["skill_bits"][np.ix_(rows, words)]
+        matched = np.bitwise_count(bits & jd_words[words]).sum(axis=1)
+        matched_core = np.bitwise_count(bits & core_words[words]).sum(axis=1)
+        missing = len(jd_skills) - matched
+        bonus = compiled["skill_counts"][rows] - matched
+
+        jd_vector = np.zeros(len(taxonomy.skill_names))
+        jd_vector[[taxonomy.skill_id(skill) for skill in jd_skills]] = 1
+        depth = compiled["depth"][rows] @ jd_vector
+
+        # Factor 5: per-domain overlap with the JD profile (see resume_parser.domain_relevance)
+        jd_domain_total = jd_domain_profile.sum()
+        if jd_domain_total == 0:
+            domain = np.full(len(rows), 50.0)
+        else:
+            overlap = np.minimum(compiled["domain_profiles"][rows], jd_domain_profile).sum(axis=1)
+            domain = (overlap / jd_domain_total) * 100
+
+        scores = ComprehensiveScorer.score_batch(
+            compiled["levels"][rows], len(jd_skills), matched, matched_core,
+            missing, bonus, depth, domain, compiled["ats"][rows],
+        )
+
+        jd_text_vector = self.similarity_model.transform([job_description])
+        similarity = (compiled["documents"][rows] @ jd_text_vector.T).toarray().ravel() * 100
+
+        # Best final score first, text similarity breaks ties
+        order = np.lexsort((-similarity, -scores["final_score"]))[:top_k]
+
+        results = []
+        for i in order:
+            record = records[rows[i]]
+            row_mask = int.from_bytes(compiled["skill_bits"][rows[i]].tobytes(), "little")
+            gap = skill_gap_masks(row_mask, jd_mask, role_core_mask)
+            matched_skills = taxonomy.skills_from_mask(gap["matched"])
+            missing_skills = taxonomy.skills_from_mask(gap["missing"])
+            critical_missing_skills = taxonomy.skills_from_mask(gap["critical_missing"])
+            final_score = float(scores["final_score"][i])
+            results.append({
+                "candidate_id": record["id"],
+                "name": record["name"],
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
+                "critical_missing_skills": critical_missing_skills,
+                "experience_level": record["experience_level"],
+                "match_classification": classify_match(final_score, critical_missing_skills),
+                "score_breakdown_7_factor": {
+                    "required_skill_coverage": float(scores["required_skills"][i]),
+                    "skill_relevance": float(scores["skill_relevance"][i]),
+                    "skill_depth_signals": float(scores["skill_depth"][i]),
+                    "experience_level_alignment": float(scores["experience_alignment"][i]),
+                    "domain_context": float(scores["domain_context"][i]),
+                    "ats_optimization": float(scores["ats_optimization"][i]),
+                    "signal_vs_noise_ratio": float(scores["signal_noise"][i]),
+                },
+                "scoring_breakdown": {
+                    "final_score": final_score,
+                    "text_similarity_score": round(float(similarity[i]), 2),
+                },
+            })
+        return results
+
+    # === RESCORING ===
+
+    def rescore(self, job, candidate_ids=None):
+        """
+        Score stored candidates against a prepared job description
+        candidate_ids: default every candidate in the pool
+
+        Returns (results, unknown candidate IDs, reused): one /analyze
+        response per candidate plus candidate_id and name, and how many
+        skill-score halves came from the memo. Text similarity is the
+        one /analyze computes for the same resume and JD
+        """
+        taxonomy = get_taxonomy()
+        jd_mask = job_skill_mask(job, taxonomy)
+        # Stored features are the resume's transform() under this model
+        shared_model = job["similarity_vector"] is not None and self.similarity_model is get_similarity_model()
+
+        with self._lock:
+            if candidate_ids is None:
+                candidate_ids = list(self.positions)
+            records = {
+                candidate_id: self.records[self.positions[candidate_id]]
+                for candidate_id in candidate_ids if candidate_id in self.positions
+            }
+
+        results = []
+        unknown = []
+        reused = 0
+        for candidate_id in candidate_ids:
+            record = records.get(candidate_id)
+            if record is None:
+                unknown.append(candidate_id)
+                continue
+
+            key = (candidate_id, taxonomy.version, jd_mask)
+            with self._lock:
+                cached = self._skill_scores.get(key)
+                # A re-ingested candidate has a new record; its old scores don't apply
+                if cached is not None and cached[0] is record:
+                    self._skill_scores.move_to_end(key)
+                    skill_scores = cached[1]
+                    reused += 1
+                else:
+                    skill_scores = None
+            if skill_scores is None:
+                depth = dict(zip(record["skills"], record["depth"]))
+                skill_scores = score_skills(
+                    record["skills"], record["experience_level"], job,
+                    lambda matched_skills: sum(depth[skill] for skill in matched_skills),
+                )
+                self._remember_skill_scores(key, record, skill_scores)
+
+            if shared_model:
+                vector = self.similarity_model.weigh(record["features"])
+                text_similarity = round(float(vector.multiply(job["similarity_vector"]).sum()) * 100, 2)
+            else:
+                text_similarity = calculate_similarity(record["text"], job["text"], jd_vector=job["similarity_vector"])
+            response = score_response(
+                record["skills"], record["experience_level"], job, skill_scores,
+                domain_relevance(record["domain_profile"], job["domain_profile"]), record["ats"], text_similarity,
+            )
+            results.append(dict(response, candidate_id=record["id"], name=record["name"]))
+        return results, unknown, reused
+
+    def _remember_skill_scores(self, key, record, skill_scores):
+        if RESCORE_CACHE_SIZE <= 0:
+            return
+        with self._lock:
+            self._skill_scores[key] = (record, skill_scores)
+            self._skill_scores.move_to_end(key)
+            while len(self._skill_scores) > RESCORE_CACHE_SIZE:
+                self._skill_scores.popitem(last=False)
+
+    # === PERSISTENCE ===
+
+    def save(self, path=None):
+        import joblib
+
+        with self._lock:
+            joblib.dump({
+                "records": [record for record in self.records if record is not None],
+                "similarity_model": self.similarity_model,
+            }, path or CANDIDATE_INDEX_PATH)
+
+    @classmethod
+    def load(cls, path=None):
+        import joblib
+
+        data = joblib.load(path or CANDIDATE_INDEX_PATH)
+        index = cls(similarity_model=data["similarity_model"])
+        for record in data["records"]:
+            row = len(index.records)
+            index.records.append(record)
+            index.positions[record["id"]] = row
+            for skill in record["skills"]:
+                index.skill_postings[skill].add(row)
+        return index
+
+
+def _word_count(taxonomy):
+    """uint64 words per skill bitset row"""
+    return max((len(taxonomy.skill_names) + 63) // 64, 1)
+
+
+def _mask_words(mask, taxonomy):
+    """A Taxonomy.mask() int as a row of little-endian uint64 words"""
+    import numpy as np
+
+    n_words = _word_count(taxonomy)
+    return np.frombuffer(mask.to_bytes(n_words * 8, "little"), dtype="<u8")
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index():
+    """The per-process candidate index, loaded from CANDIDATE_INDEX_PATH if saved"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            if os.path.exists(CANDIDATE_INDEX_PATH):
+                _index = CandidateIndex.load()
+            else:
+                _index = CandidateIndex()
+        return _index
@@ -9,14 +9,36 @@ Evaluates resumes based on:
 5. Domain context (5%) - Related domain experience
 6. ATS optimization (3%) - Keyword clarity
 7. Signal vs noise (2%) - Focus vs scattered
+
+score_batch() computes the same seven factors and weighted score for many
+candidates at once with NumPy, for ranking a pool against one JD.
 """
 
-from skill_extractor import CORE_SKILLS_BY_ROLE, ROLE_SKILL_MAP
+from analysis_context import as_context
+from skill_extractor import skill_usage
+from taxonomy import get_taxonomy
 
 
 class ComprehensiveScorer:
     """7-Factor scoring system for professional resume analysis"""
     
+    WEIGHTS = {
+        "required_skills": 0.40,
+        "skill_relevance": 0.25,
+        "skill_depth": 0.15,
+        "experience_alignment": 0.10,
+        "domain_context": 0.05,
+        "ats_optimization": 0.03,
+        "signal_noise": 0.02,
+    }
+    
+    # Matched as token prefixes ("build" covers "builds", "building")
+    ACTION_VERBS = (
+        "build", "built", "develop", "developed", "implement", "implemented",
+        "create", "created", "design", "designed", "deploy", "deployed",
+        "manage", "managed", "optimize", "optimized", "architect", "lead"
+    )
+    
     def __init__(self, detected_role, experience_level):
         self.detected_role = detected_role
         self.experience_level = experience_level
@@ -68,7 +90,7 @@ class ComprehensiveScorer:
         Scores skills by relevance to detected role.
         Frontend skills high weight for frontend role, etc.
         """
-        core_skills = CORE_SKILLS_BY_ROLE.get(self.detected_role, [])
+        core_skills = get_taxonomy().core_skills_by_role.get(self.detected_role, ())
         
         relevant_skills = 0
         matched_relevant = 0
@@ -110,37 +132,15 @@ class ComprehensiveScorer:
         Checks if skills appear in projects/experience with action verbs
         Penalizes skills that only appear in skill list
         """
-        action_verbs = [
-            "build", "built", "develop", "developed", "implement", "implemented",
-            "create", "created", "design", "designed", "deploy", "deployed",
-            "manage", "managed", "optimize", "optimized", "architect", "lead"
-        ]
-        
-        projects_exp_text = (
-            resume_sections.get("projects", "") + " " + 
-            resume_sections.get("experience", "")
-        ).lower()
-        
-        skills_with_depth = 0
-        
-        for skill in matched_skills:
-            skill_lower = skill.lower()
-            # Check if skill appears with action verb (indicating usage)
-            for verb in action_verbs:
-                if verb in projects_exp_text and skill_lower in projects_exp_text:
-                    # Check if they're reasonably close
-                    if projects_exp_text.find(verb) < projects_exp_text.find(skill_lower) + 500:
-                        skills_with_depth += 1
-                        break
-            else:
-                # Skill found but no action verb - still credit 0.3
-                if skill_lower in projects_exp_text:
-                    skills_with_depth += 0.3
-        
-        if len(matched_skills) == 0:
+        skills_with_depth = self.skill_depth_points(resume_sections, matched_skills)
+        return self.score_skill_depth_points(skills_with_depth, len(matched_skills))
+    
+    def score_skill_depth_points(self, skills_with_depth, matched_count):
+        """Factor 3 from skill_depth_points() already summed (stored analyses)"""
+        if matched_count == 0:
             return 50  # Neutral if no matched skills
         
-        depth_percentage = (skills_with_depth / len(matched_skills)) * 100
+        depth_percentage = (skills_with_depth / matched_count) * 100
         
         # Scoring
         if depth_percentage >= 80:
@@ -157,6 +157,29 @@ class ComprehensiveScorer:
         self.scores["skill_depth"] = round(score, 1)
         return score
     
+    @classmethod
+    def skill_depth_points(cls, resume_sections, matched_skills):
+        """
+        Depth credit summed over matched skills (factor 3 input)
+        1 per skill used with an action verb, 0.3 if only mentioned
+        resume_sections: AnalysisContext or parse_resume_sections() dict
+        
+        Verb/skill proximity is checked over every occurrence in the
+        projects and experience sections via the context's positional
+        index, not just the first one
+        """
+        usage = skill_usage(as_context(resume_sections), matched_skills, cls.ACTION_VERBS)
+        
+        skills_with_depth = 0
+        for skill in matched_skills:
+            if usage[skill] == "used":
+                skills_with_depth += 1
+            elif usage[skill] == "mentioned":
+                # Skill found but no action verb - still credit 0.3
+                skills_with_depth += 0.3
+        
+        return skills_with_depth
+    
     def score_factor_4_experience_alignment(self, missing_skills_count, jd_skills_count):
         """
         Factor 4: Experience Level Alignment (10% weight)
@@ -232,11 +255,11 @@ class ComprehensiveScorer:
         - Clear skill mentions
         - Keyword consistency
         """
-        resume_lower = resume_text.lower()
-        
-        # Check for standard section headers
-        section_headers = ["skills", "experience", "projects", "education", "technical"]
-        sections_found = sum(1 for header in section_headers if header in resume_lower)
+        return self.score_ats_features(self.ats_features(resume_text))
+    
+    def score_ats_features(self, ats_features):
+        """Factor 6 from ats_features() already extracted (stored analyses)"""
+        sections_found, has_bullets, has_contact, caps_ratio = ats_features
         
         # Check for common ATS-friendly patterns
         ats_score = 0
@@ -250,15 +273,14 @@ class ComprehensiveScorer:
             ats_score += 10
         
         # Has bullet points or numbered list
-        if "•" in resume_text or "•" in resume_text or "-" in resume_text[:100]:
+        if has_bullets:
             ats_score += 25
         
         # Has contact info pattern (email, phone)
-        if any(pattern in resume_lower for pattern in ["@", "//", "http"]):
+        if has_contact:
             ats_score += 20
         
         # Has consistent formatting (not all caps, not excessive symbols)
-        caps_ratio = sum(1 for c in resume_text if c.isupper()) / max(len(resume_text), 1)
         if caps_ratio < 0.3:  # Less than 30% caps
             ats_score += 15
         
@@ -268,6 +290,18 @@ class ComprehensiveScorer:
         self.scores["ats_optimization"] = round(ats_score, 1)
         return ats_score
     
+    @classmethod
+    def ats_features(cls, resume_text):
+        """
+        Factor 6 inputs: (sections_found, has_bullets, has_contact, caps_ratio)
+        resume_text: string or AnalysisContext (features come from its single scan)
+        """
+        features = as_context(resume_text).features
+        
+        # Standard section headers, bullets, contact info (email, links), caps
+        sections_found = len(features["header_hits"])
+        return sections_found, features["has_bullets"], features["has_contact"], features["caps_ratio"]
+    
     def score_factor_7_signal_noise_ratio(self, bonus_skills, missing_skills):
         """
         Factor 7: Signal vs Noise Ratio (2% weight)
@@ -316,18 +350,8 @@ class ComprehensiveScorer:
         6. ATS optimization: 3%
         7. Signal vs noise: 2%
         """
-        weights = {
-            "required_skills": 0.40,
-            "skill_relevance": 0.25,
-            "skill_depth": 0.15,
-            "experience_alignment": 0.10,
-            "domain_context": 0.05,
-            "ats_optimization": 0.03,
-            "signal_noise": 0.02,
-        }
-        
         weighted_score = 0
-        for factor, weight in weights.items():
+        for factor, weight in self.WEIGHTS.items():
             if factor in factor_scores:
                 weighted_score += factor_scores[factor] * weight
         
@@ -336,3 +360,108 @@ class ComprehensiveScorer:
     def generate_score_breakdown(self):
         """Return all 7 factor scores"""
         return self.scores
+    
+    @classmethod
+    def score_batch(cls, experience_levels, jd_skills_count, matched_counts, matched_core_counts,
+                    missing_counts, bonus_counts, depth_points, domain_relevance, ats_features):
+        """
+        Vectorized 7-factor scoring for many candidates against one JD
+        
+        Every argument is per candidate (array-like of length n) except
+        jd_skills_count, which may also be a scalar:
+        - experience_levels: extract_experience_level() results
+        - matched_counts: JD skills the resume has
+        - matched_core_counts: of those, how many are core for the JD role
+        - missing_counts / bonus_counts: len(missing_skills) / len(bonus_skills)
+        - depth_points: skill_depth_points() for the matched skills
+        - domain_relevance: detect_domain_context() score
+        - ats_features: ats_features() tuples
+        
+        Returns dict of float64 arrays keyed like generate_score_breakdown(),
+        plus "final_score". Values are identical to the per-candidate
+        score_factor_* / calculate_weighted_score path.
+        """
+        import numpy as np
+
+        levels = np.asarray(experience_levels)
+        n = len(levels)
+        jd_count = np.broadcast_to(np.asarray(jd_skills_count, dtype=np.float64), (n,))
+        matched = np.asarray(matched_counts, dtype=np.float64)
+        matched_core = np.asarray(matched_core_counts, dtype=np.float64)
+        missing = np.asarray(missing_counts, dtype=np.float64)
+        bonus = np.asarray(bonus_counts, dtype=np.float64)
+        depth = np.asarray(depth_points, dtype=np.float64)
+        domain = np.asarray(domain_relevance, dtype=np.float64)
+        ats = np.asarray(ats_features, dtype=np.float64).reshape(n, 4)
+        
+        has_jd = jd_count > 0
+        safe_jd = np.where(has_jd, jd_count, 1)
+        
+        # Factor 1: Required skill coverage
+        match_pct = (matched / safe_jd) * 100
+        factor1 = np.select(
+            [match_pct >= 90, match_pct >= 80, match_pct >= 70, match_pct >= 60, match_pct >= 50, match_pct >= 30],
+            [100, 90, 80, 70, 60, 40],
+            np.maximum(0, match_pct * 0.5),
+        )
+        factor1 = np.where(has_jd, factor1, 100)
+        
+        # Factor 2: Skill relevance (1 per core match, 0.5 per other match)
+        matched_relevant = matched_core + (matched - matched_core) * 0.5
+        relevance_pct = (matched_relevant / safe_jd) * 100
+        factor2 = np.select(
+            [relevance_pct >= 90, relevance_pct >= 70, relevance_pct >= 50, relevance_pct >= 30],
+            [100, 85, 70, 50],
+            np.maximum(0, relevance_pct * 0.8),
+        )
+        factor2 = np.where(has_jd, factor2, 50)
+        
+        # Factor 3: Skill depth signals
+        depth_pct = (depth / np.where(matched > 0, matched, 1)) * 100
+        factor3 = np.select(
+            [depth_pct >= 80, depth_pct >= 60, depth_pct >= 40, depth_pct >= 20],
+            [100, 85, 70, 50],
+            30,
+        )
+        factor3 = np.where(matched > 0, factor3, 50)
+        
+        # Factor 4: Experience level alignment
+        missing_pct = (missing / safe_jd) * 100
+        internship = np.select([missing_pct <= 30, missing_pct <= 50, missing_pct <= 70], [100, 85, 70], 50)
+        junior = np.select([missing_pct <= 20, missing_pct <= 40, missing_pct <= 60], [100, 85, 70], 50)
+        senior = np.select([missing_pct <= 10, missing_pct <= 25, missing_pct <= 40], [100, 90, 75], 50)
+        factor4 = np.select([levels == "internship", levels == "junior"], [internship, junior], senior)
+        factor4 = np.where(has_jd, factor4, 100)
+        
+        # Factor 5: Domain context
+        factor5 = domain
+        
+        # Factor 6: ATS optimization
+        sections_found, has_bullets, has_contact, caps_ratio = ats.T
+        factor6 = np.select([sections_found >= 3, sections_found >= 2], [30, 20], 10)
+        factor6 = factor6 + np.where(has_bullets > 0, 25, 0)
+        factor6 = factor6 + np.where(has_contact > 0, 20, 0)
+        factor6 = factor6 + np.where(caps_ratio < 0.3, 15, 0)
+        factor6 = np.minimum(factor6, 100)
+        
+        # Factor 7: Signal vs noise
+        factor7 = np.select([missing > 0, bonus == 0, bonus <= 3, bonus <= 6], [50, 75, 90, 75], 60)
+        
+        factors = {
+            "required_skills": factor1.astype(np.float64),
+            "skill_relevance": factor2.astype(np.float64),
+            "skill_depth": factor3.astype(np.float64),
+            "experience_alignment": factor4.astype(np.float64),
+            "domain_context": factor5,
+            "ats_optimization": factor6.astype(np.float64),
+            "signal_noise": factor7.astype(np.float64),
+        }
+        
+        # Same accumulation order as calculate_weighted_score
+        weighted = np.zeros(n, dtype=np.float64)
+        for factor, weight in cls.WEIGHTS.items():
+            weighted += factors[factor] * weight
+        
+        # Python's round() is correctly rounded, np.round is not; keep them identical
+        factors["final_score"] = np.array([round(score, 2) for score in weighted.tolist()], dtype=np.float64)
+        return factors
@@ -0,0 +1,182 @@
+"""
+Content-addressed cache of extracted resume text
+
+Keyed by the SHA-256 of the PDF bytes, so a candidate re-uploading the
+same file against another opening skips PDF parsing entirely. Each
+entry holds the extracted text, its section offsets (AnalysisContext
+section_spans) and the extraction report.
+
+Two tiers:
+- memory: bounded LRU (EXTRACTION_CACHE_SIZE entries)
+- disk (optional, EXTRACTION_CACHE_DIR): one JSON file per entry, oldest
+  files evicted once the tier grows past EXTRACTION_CACHE_DISK_MAX_BYTES
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+EXTRACTION_CACHE_SIZE = int(os.environ.get("EXTRACTION_CACHE_SIZE", 512))
+EXTRACTION_CACHE_DIR = os.environ.get("EXTRACTION_CACHE_DIR") or None
+EXTRACTION_CACHE_DISK_MAX_BYTES = int(os.environ.get("EXTRACTION_CACHE_DISK_MAX_BYTES", 512 * 1024 * 1024))
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_pdf_source(pdf_source):
+    """SHA-256 hex digest of PDF bytes or of the file at a path"""
+    digest = hashlib.sha256()
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        digest.update(pdf_source)
+    else:
+        with open(pdf_source, "rb") as pdf_file:
+            for chunk in iter(lambda: pdf_file.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Two-tier (memory LRU + optional disk) cache of extraction results"""
+
+    def __init__(self, max_entries=EXTRACTION_CACHE_SIZE, disk_dir=None, disk_max_bytes=EXTRACTION_CACHE_DISK_MAX_BYTES):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None  # Computed lazily from the directory
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached entry for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        """Store entry in memory and, when configured, on disk"""
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def stats(self):
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_max_entries": self.max_entries,
+                "disk_enabled": bool(self.disk_dir),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self):
+        """Drop the memory tier (the disk tier is left alone)"""
+        with self._lock:
+            self._entries.clear()
+
+    # === MEMORY TIER (caller holds the lock) ===
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # === DISK TIER ===
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], key + ".json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+            os.utime(path)  # Mark as recently used for eviction
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = json.dumps(entry).encode("utf-8")
+
+        # Write-then-rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(payload)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(payload)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _scan_disk_files(self):
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _scan_disk_bytes(self):
+        return sum(size for _, size, _ in self._scan_disk_files())
+
+    def _evict_disk(self):
+        """Delete least recently used files until the tier is at 90% of its limit"""
+        files = sorted(self._scan_disk_files())
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+
+extraction_cache = ExtractionCache(disk_dir=EXTRACTION_CACHE_DIR)
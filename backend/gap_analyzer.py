@@ -1,18 +1,40 @@
-def find_skill_gap(resume_skills, jd_skills):
-    resume_set = set(resume_skills)
-    jd_set = set(jd_skills)
+from taxonomy import get_taxonomy
+
+
+def skill_gap_masks(resume_mask, jd_mask, core_mask=0):
+    """
+    Matched, missing, bonus and critical-missing skills as skill bitmaps
+    (Taxonomy.mask() ints), one bitwise operation each
+    core_mask: the detected role's core skills (Taxonomy.core_masks)
+    """
+    missing = jd_mask & ~resume_mask
+    return {
+        "matched": resume_mask & jd_mask,
+        "missing": missing,
+        "bonus": resume_mask & ~jd_mask,
+        "critical_missing": missing & core_mask,
+    }
+
 
-    missing_skills = list(jd_set - resume_set)
-    return missing_skills
+def _difference(skills, other_skills):
+    """Names in skills but not in other_skills: bitmaps for known skills, sets for the rest"""
+    taxonomy = get_taxonomy()
+    mask, unknown = taxonomy.split_mask(skills)
+    other_mask, other_unknown = taxonomy.split_mask(other_skills)
+    difference = taxonomy.skills_from_mask(mask & ~other_mask)
+    if unknown:
+        difference.extend(set(unknown) - set(other_unknown))
+    return difference
+
+
+def find_skill_gap(resume_skills, jd_skills):
+    """JD skills missing from the resume"""
+    return _difference(jd_skills, resume_skills)
 
 
 def get_bonus_skills(resume_skills, jd_skills):
     """Get extra skills on resume that aren't in job description"""
-    resume_set = set(resume_skills)
-    jd_set = set(jd_skills)
-    
-    bonus_skills = list(resume_set - jd_set)
-    return bonus_skills
+    return _difference(resume_skills, jd_skills)
 
 
 def classify_match(comprehensive_score, critical_missing_skills=None):
@@ -43,37 +65,13 @@ def classify_match(comprehensive_score, critical_missing_skills=None):
         return "Early Stage"
 
 
-# Skill priority categorization
-CORE_SKILLS = {
-    "frontend": ["javascript", "react", "html", "css"],
-    "backend": ["python", "java", "flask", "django"],
-    "database": ["sql", "mysql"],
-    "ml": ["machine learning", "deep learning", "nlp"]
-}
-
-SECONDARY_SKILLS = ["git", "algorithms", "data structures", "testing"]
-
-# Skill-specific actionable improvements
-SKILL_ACTIONS = {
-    "javascript": "Add a small JavaScript project demonstrating DOM manipulation, API calls, or form validation.",
-    "react": "Build a React component-based project showcasing state management and reusable components.",
-    "python": "Create a Python script or automation project that solves a real problem.",
-    "java": "Develop a Java application or contribute to a Java open-source project.",
-    "html": "Create at least one multi-page HTML project with semantic markup.",
-    "css": "Build a responsive design project using CSS Grid or Flexbox.",
-    "flask": "Create a Flask REST API with proper routing and error handling.",
-    "django": "Build a full Django application with models, views, and URL routing.",
-    "sql": "Write complex SQL queries and create a database schema project.",
-    "mysql": "Design and optimize a MySQL database schema for a real-world scenario.",
-    "machine learning": "Build an end-to-end ML project with data preprocessing, training, and evaluation.",
-    "deep learning": "Implement a neural network using TensorFlow or PyTorch.",
-    "nlp": "Create an NLP project like sentiment analysis, chatbot, or text classification.",
-    "git": "Demonstrate active GitHub contributions with meaningful commits and documentation.",
-}
+# Skill priority categories, secondary skills and skill-specific
+# actionable improvements come from the taxonomy data file (taxonomy.py)
 
 
 def prioritize_missing_skills(missing_skills):
     """Categorize missing skills by priority (high/medium/low)"""
+    taxonomy = get_taxonomy()
     high_priority = []
     medium_priority = []
     low_priority = []
@@ -81,14 +79,14 @@ def prioritize_missing_skills(missing_skills):
     for skill in missing_skills:
         is_core = False
         # Check all core skill categories
-        for category, skills_list in CORE_SKILLS.items():
+        for category, skills_list in taxonomy.skill_categories.items():
             if skill in skills_list:
                 high_priority.append(skill)
                 is_core = True
                 break
         
         if not is_core:
-            if skill in SECONDARY_SKILLS:
+            if skill in taxonomy.secondary_skills:
                 low_priority.append(skill)
             else:
                 medium_priority.append(skill)
@@ -98,11 +96,12 @@ def prioritize_missing_skills(missing_skills):
 
 def find_bridging_suggestions(resume_skills, missing_skills, bonus_skills):
     """Find ways to bridge existing skills to missing ones"""
+    core_skills = get_taxonomy().skill_categories
     bridging = []
     
     # Python/Flask + missing frontend skills
     if "python" in resume_skills and "flask" in resume_skills:
-        frontend_missing = [s for s in missing_skills if s in CORE_SKILLS["frontend"]]
+        frontend_missing = [s for s in missing_skills if s in core_skills.get("frontend", ())]
         if frontend_missing:
             bridging.append(
                 f"Combine your Flask + Python expertise with HTML/CSS/JavaScript to create a full-stack project. "
@@ -111,7 +110,7 @@ def find_bridging_suggestions(resume_skills, missing_skills, bonus_skills):
     
     # Java + missing web skills
     if "java" in resume_skills:
-        web_missing = [s for s in missing_skills if s in CORE_SKILLS["frontend"]]
+        web_missing = [s for s in missing_skills if s in core_skills.get("frontend", ())]
         if web_missing:
             bridging.append(
                 "Use your Java knowledge to build a Spring Boot REST API with a frontend (HTML/CSS/JS). "
@@ -120,7 +119,7 @@ def find_bridging_suggestions(resume_skills, missing_skills, bonus_skills):
     
     # Database + missing backend skills
     if ("sql" in resume_skills or "mysql" in resume_skills) and missing_skills:
-        backend_missing = [s for s in missing_skills if s in CORE_SKILLS["backend"]]
+        backend_missing = [s for s in missing_skills if s in core_skills.get("backend", ())]
         if backend_missing:
             bridging.append(
                 "Leverage your database expertise by building a data-driven application using missing backend skills. "
@@ -135,10 +134,11 @@ def group_missing_skills_into_projects(missing_skills, detected_role):
     Group missing skills into realistic project-based learning paths
     Instead of per-skill nagging, suggest grouped skill projects
     """
+    core_skills = get_taxonomy().skill_categories
     projects = []
     
     # Frontend project group
-    frontend_skills = [s for s in missing_skills if s in CORE_SKILLS["frontend"]]
+    frontend_skills = [s for s in missing_skills if s in core_skills.get("frontend", ())]
     if frontend_skills and len(frontend_skills) > 0:
         projects.append({
             "title": "Frontend Fundamentals Project",
@@ -148,7 +148,7 @@ def group_missing_skills_into_projects(missing_skills, detected_role):
         })
     
     # Backend project group
-    backend_skills = [s for s in missing_skills if s in CORE_SKILLS["backend"]]
+    backend_skills = [s for s in missing_skills if s in core_skills.get("backend", ())]
     if backend_skills and len(backend_skills) > 0:
         projects.append({
             "title": "Backend API Project",
@@ -158,7 +158,7 @@ def group_missing_skills_into_projects(missing_skills, detected_role):
         })
     
     # Data/Database project group
-    db_skills = [s for s in missing_skills if s in CORE_SKILLS["database"]]
+    db_skills = [s for s in missing_skills if s in core_skills.get("database", ())]
     if db_skills and len(db_skills) > 0:
         projects.append({
             "title": "Database Design Project",
@@ -168,7 +168,7 @@ def group_missing_skills_into_projects(missing_skills, detected_role):
         })
     
     # ML/Data project group
-    ml_skills = [s for s in missing_skills if s in CORE_SKILLS["ml"]]
+    ml_skills = [s for s in missing_skills if s in core_skills.get("ml", ())]
     if ml_skills and len(ml_skills) > 0:
         projects.append({
             "title": "ML/Data Science Project",
@@ -0,0 +1,226 @@
+"""
+Asynchronous analysis jobs
+
+/analyze can hand a resume off instead of holding the request thread
+for the whole pipeline: the upload is enqueued, a worker process runs
+analyze_resume_bytes, and the result is picked up from /jobs/<id>.
+
+- JobStore: job status and results in SQLite. JOB_DB_PATH defaults to
+  an in-memory database (jobs visible to this process only); point it
+  at a file to share job status between several server processes
+- JobQueue: submits to its own worker pool and records each result
+  from the future's completion callback. wait() gives callers a bounded
+  wait, so small documents can still come back in the same request.
+  At most JOB_MAX_PENDING jobs are unfinished at once; past that,
+  submit() raises admission.Overloaded (503 with Retry-After)
+
+Finished jobs are dropped after JOB_RESULT_TTL seconds.
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from admission import Overloaded
+from aggregates import aggregates
+from analysis_pipeline import analyze_resume_bytes
+import metrics
+
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", ":memory:")
+JOB_MAX_WORKERS = int(os.environ.get("JOB_MAX_WORKERS", os.cpu_count() or 1))
+JOB_MAX_WAIT = float(os.environ.get("JOB_MAX_WAIT", 30.0))
+JOB_RESULT_TTL = float(os.environ.get("JOB_RESULT_TTL", 3600))
+# Unfinished jobs (queued or running) this process accepts
+JOB_MAX_PENDING = int(os.environ.get("JOB_MAX_PENDING", JOB_MAX_WORKERS * 8))
+JOB_POLL_INTERVAL = 0.1
+
+# Weight of the newest sample in the job service-time moving average
+_SERVICE_TIME_SMOOTHING = 0.2
+
+PENDING_STATUSES = ("queued", "running")
+
+
+class JobStore:
+    """Job status and results in one SQLite table"""
+
+    def __init__(self, path=None):
+        self.path = path or JOB_DB_PATH
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, status TEXT NOT NULL, filename TEXT,"
+                " created_at REAL NOT NULL, finished_at REAL, result TEXT, error TEXT)"
+            )
+
+    def create(self, job_id, filename=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, filename, created_at) VALUES (?, 'queued', ?, ?)",
+                (job_id, filename, time.time()),
+            )
+
+    def finish(self, job_id, result=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                ("failed" if error else "done", time.time(),
+                 None if result is None else json.dumps(result), error, job_id),
+            )
+
+    def get(self, job_id):
+        """Job record as a dict, or None for an unknown (or expired) job"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, filename, created_at, finished_at, result, error FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        record = {
+            "job_id": row[0],
+            "status": row[1],
+            "filename": row[2],
+            "created_at": row[3],
+            "finished_at": row[4],
+        }
+        if row[5] is not None:
+            record["result"] = json.loads(row[5])
+        if row[6] is not None:
+            record["error"] = row[6]
+        return record
+
+    def purge(self, finished_before):
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (finished_before,))
+
+
+class JobQueue:
+    """Runs analyses in worker processes and tracks them in a JobStore"""
+
+    def __init__(self, store=None, max_workers=None, max_pending=None):
+        self.store = store or JobStore()
+        self.max_workers = max_workers or JOB_MAX_WORKERS
+        self.max_pending = max_pending or JOB_MAX_PENDING
+        self.service_seconds = None  # Moving average of a job's analysis time
+        self._pool = None
+        self._pending = {}  # job_id -> (future, completion event), this process only
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def start(self):
+        """Fork the worker processes now rather than on the first submit"""
+        self._get_pool().submit(int).result()
+
+    def retry_after(self):
+        """Seconds until the backlog has likely drained by one job"""
+        service_seconds = self.service_seconds or 1.0
+        return max(math.ceil(service_seconds / self.max_workers), 1)
+
+    def submit(self, pdf_bytes, job, filename=None):
+        """
+        Enqueue one resume against a prepared job description; returns the job ID
+        Raises Overloaded when JOB_MAX_PENDING jobs are already unfinished
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                metrics.admission_rejections.inc(reason="job_queue_full")
+                raise Overloaded("job_queue_full", self.retry_after())
+            # Held before the job exists, so concurrent submits can't overshoot
+            self._pending[job_id] = (None, threading.Event())
+
+        try:
+            self.store.purge(time.time() - JOB_RESULT_TTL)
+            self.store.create(job_id, filename)
+            future = self._get_pool().submit(analyze_resume_bytes, pdf_bytes, job)
+        except BaseException:
+            with self._lock:
+                del self._pending[job_id]
+            raise
+        with self._lock:
+            self._pending[job_id] = (future, self._pending[job_id][1])
+        future.add_done_callback(lambda done: self._complete(job_id, job, done))
+        return job_id
+
+    def _complete(self, job_id, job, future):
+        try:
+            result = future.result()
+        except Exception as exc:
+            self.store.finish(job_id, error=f"Could not analyze resume: {exc}")
+        else:
+            diagnostics = result["diagnostics"]
+            service_seconds = sum(diagnostics["stage_seconds"].values())
+            if self.service_seconds is None:
+                self.service_seconds = service_seconds
+            else:
+                self.service_seconds += _SERVICE_TIME_SMOOTHING * (service_seconds - self.service_seconds)
+            metrics.observe_analysis(diagnostics["stage_seconds"], diagnostics["pdf_extraction"], diagnostics.pop("text_chars"))
+            aggregates.record(job, result)
+            self.store.finish(job_id, result=result)
+        finally:
+            # The event is set only once the store has the final status
+            with self._lock:
+                _, finished = self._pending.pop(job_id, (None, None))
+            if finished is not None:
+                finished.set()
+
+    def get(self, job_id):
+        """Current job record; queued jobs already picked up by a worker read as running"""
+        record = self.store.get(job_id)
+        if record is not None and record["status"] == "queued":
+            with self._lock:
+                future, _ = self._pending.get(job_id, (None, None))
+            if future is not None and future.running():
+                record["status"] = "running"
+        return record
+
+    def wait(self, job_id, timeout=0):
+        """
+        Block up to timeout seconds (capped at JOB_MAX_WAIT) for a job to finish
+        Returns the job record, finished or not
+        """
+        timeout = min(max(timeout, 0.0), JOB_MAX_WAIT)
+        with self._lock:
+            _, finished = self._pending.get(job_id, (None, None))
+        if finished is not None:
+            finished.wait(timeout)
+            return self.get(job_id)
+
+        # Submitted by another process sharing the store: poll it
+        deadline = time.monotonic() + timeout
+        record = self.get(job_id)
+        while record is not None and record["status"] in PENDING_STATUSES and time.monotonic() < deadline:
+            time.sleep(min(JOB_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+            record = self.get(job_id)
+        return record
+
+    def pending_count(self):
+        """Jobs submitted by this process that have not finished yet"""
+        return len(self._pending)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """The per-process job queue, created on first use"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,205 @@
+"""
+Low-overhead pipeline metrics with a Prometheus text exposition
+
+- StageTimer: per-analysis stage stopwatch (one perf_counter pair per
+  stage), carried through load_resume / prepare_job_description /
+  analyze_resume_text and shipped back from batch worker processes
+- Counter / Histogram: labeled, lock-protected, fixed-bucket metrics
+- render(): Prometheus text format for the /metrics endpoint
+
+Metrics are per process; with several server processes each one exposes
+its own series.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+REQUEST_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200)
+CHAR_BUCKETS = (1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 1000000)
+
+_registry = []
+_collected = []  # (name, help text, type, read) for metrics read at scrape time
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        return self._values.get(key, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels"""
+
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = tuple(label_names)
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def register_gauge(name, help_text, read):
+    """Gauge read at scrape time; read() returns a number or {((label, value), ...): number}"""
+    _collected.append((name, help_text, "gauge", read))
+
+
+def register_counter(name, help_text, read):
+    """
+    Counter read at scrape time, for totals another component already
+    keeps (name ends in _total); read() as for register_gauge
+    """
+    _collected.append((name, help_text, "counter", read))
+
+
+def render():
+    """All metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for name, help_text, metric_type, read in _collected:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        value = read()
+        if isinstance(value, dict):
+            for labels, labeled_value in sorted(value.items()):
+                label_names = [label for label, _ in labels]
+                label_values = [label_value for _, label_value in labels]
+                lines.append(f"{name}{_format_labels(label_names, label_values)} {_format_value(labeled_value)}")
+        else:
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# === PIPELINE METRICS ===
+
+stage_seconds = Histogram(
+    "resume_analyzer_stage_seconds", "Time spent in each analysis stage", STAGE_BUCKETS, ("stage",)
+)
+requests_total = Counter(
+    "resume_analyzer_requests_total", "HTTP requests by endpoint and status", ("endpoint", "status")
+)
+request_seconds = Histogram(
+    "resume_analyzer_request_seconds", "HTTP request latency by endpoint", REQUEST_BUCKETS, ("endpoint",)
+)
+analyses_total = Counter(
+    "resume_analyzer_analyses_total", "Completed resume analyses"
+)
+pdf_pages = Histogram(
+    "resume_analyzer_pdf_pages", "Pages per analyzed PDF", PAGE_BUCKETS
+)
+resume_text_chars = Histogram(
+    "resume_analyzer_resume_text_chars", "Extracted resume text size in characters", CHAR_BUCKETS
+)
+rescored_candidates = Counter(
+    "resume_analyzer_rescored_candidates_total", "Candidates rescored by /rescore, by whether their skill scores were reused", ("skill_scores",)
+)
+
+# === ADMISSION CONTROL ===
+
+admission_rejections = Counter(
+    "resume_analyzer_admission_rejections_total", "Requests turned away before analysis, by reason", ("reason",)
+)
+admission_wait_seconds = Histogram(
+    "resume_analyzer_admission_wait_seconds", "Time admitted requests waited for an analysis slot", REQUEST_BUCKETS
+)
+
+
+class StageTimer:
+    """Accumulates wall time per stage for one analysis"""
+
+    def __init__(self):
+        self.seconds = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - started
+
+
+def observe_analysis(stage_durations, extraction=None, text_chars=None):
+    """Fold one finished analysis (possibly from a worker process) into the metrics"""
+    for stage, seconds in stage_durations.items():
+        stage_seconds.observe(seconds, stage=stage)
+    analyses_total.inc()
+    if extraction:
+        pdf_pages.observe(extraction.get("page_count", 0))
+    if text_chars is not None:
+        resume_text_chars.observe(text_chars)
@@ -0,0 +1,304 @@
+"""
+Page-parallel PDF text extraction
+
+Pages are split into contiguous chunks and extracted in a shared process
+pool (short documents are extracted inline, where pool overhead would
+dominate). Each page is extracted exactly once and the page texts are
+joined in one pass.
+
+Limits:
+- max_pages: pages beyond the cap are skipped (reported as truncated)
+- max_chars: text beyond the cap is dropped (reported as chars_truncated)
+- page_time_budget: seconds allowed per page; each chunk gets a deadline
+  of budget x pages, checked by the worker between pages: pages not
+  started by then are reported as "timed_out" and the pages done so far
+  are kept. Slow pages that do finish are flagged "over_budget". A page
+  already being extracted can't be interrupted, so the overrun is one
+  page: when a chunk isn't back shortly after its deadline, all its pages
+  are reported "timed_out" and the worker stays busy until that page
+  finishes, then extracts nothing more for the chunk
+
+Low-memory mode, used for sources of at least PDF_LOW_MEMORY_BYTES or
+documents of more than PDF_LOW_MEMORY_PAGES pages, extracts inline one
+page at a time: no page list is kept, each page's parsed objects are
+released as soon as its text is out, and extraction stops once max_chars
+is reached. Peak resident memory (sampled after each page) is reported.
+
+extract_pdf() returns the text plus a per-page timing report so slow
+documents can be identified. pdfplumber is imported on first use.
+"""
+
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", 100))
+PDF_PAGE_TIME_BUDGET = float(os.environ.get("PDF_PAGE_TIME_BUDGET", 10.0))
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", os.cpu_count() or 1))
+
+# Documents with fewer pages than this are extracted in-process
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 4))
+
+PDF_MAX_CHARS = int(os.environ.get("PDF_MAX_CHARS", 1_000_000))
+
+# Sources at least this large (bytes), or with more pages, use low-memory mode
+PDF_LOW_MEMORY_BYTES = int(os.environ.get("PDF_LOW_MEMORY_BYTES", 8 * 1024 * 1024))
+PDF_LOW_MEMORY_PAGES = int(os.environ.get("PDF_LOW_MEMORY_PAGES", 150))
+
+# Extra time allowed per chunk for the worker to open the document
+_CHUNK_OPEN_GRACE = 2.0
+# Time a worker gets past its chunk's deadline to hand back the pages it finished
+_CHUNK_RETURN_GRACE = 1.0
+
+_page_pool = None
+
+
+def get_page_pool():
+    """Create the shared page extraction pool on first use"""
+    global _page_pool
+    if _page_pool is None:
+        _page_pool = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+    return _page_pool
+
+
+def _open_source(pdf_source):
+    """pdfplumber accepts paths and file objects; wrap raw bytes"""
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(pdf_source)
+    return pdf_source
+
+
+def _extract_pages(pdf, page_indices, page_time_budget, deadline=None):
+    """
+    Extract the given pages of an open document, once each, with timings
+    Pages not started by deadline (time.time()) are reported as "timed_out"
+    """
+    results = []
+    for position, index in enumerate(page_indices):
+        if deadline is not None and time.time() >= deadline:
+            results.extend(_timed_out(page_indices[position:]))
+            break
+        started = time.perf_counter()
+        page = pdf.pages[index]
+        text = page.extract_text() or ""
+        # Each page is extracted once: drop its parsed objects right away
+        page.close()
+        seconds = time.perf_counter() - started
+        status = "ok" if text else "empty"
+        if page_time_budget and seconds > page_time_budget:
+            status = "over_budget"
+        results.append((index, text, seconds, status))
+    return results
+
+
+def _extract_page_range(pdf_source, page_indices, page_time_budget, deadline=None):
+    """Process pool entry point: open the document and extract a chunk"""
+    import pdfplumber
+
+    # Queued behind other work until past its deadline
+    if deadline is not None and time.time() >= deadline:
+        return _timed_out(page_indices)
+    with pdfplumber.open(_open_source(pdf_source)) as pdf:
+        return _extract_pages(pdf, page_indices, page_time_budget, deadline)
+
+
+def _timed_out(page_indices):
+    return [(index, "", None, "timed_out") for index in page_indices]
+
+
+def _chunk(indices, chunk_count):
+    """Split indices into at most chunk_count contiguous, near-equal chunks"""
+    size, extra = divmod(len(indices), chunk_count)
+    chunks = []
+    start = 0
+    for i in range(chunk_count):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            chunks.append(indices[start:end])
+        start = end
+    return chunks
+
+
+def _rss_bytes():
+    """Current resident set size (Linux), else the process's peak so far"""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _source_size(pdf_source):
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return len(pdf_source)
+    try:
+        return os.path.getsize(pdf_source)
+    except (OSError, TypeError):
+        return 0
+
+
+def _declared_page_count(pdf):
+    """Page count from the document catalog, without building pdf.pages"""
+    from pdfminer.pdftypes import resolve1
+
+    try:
+        return int(resolve1(pdf.doc.catalog["Pages"])["Count"])
+    except Exception:
+        return None
+
+
+def count_pages(pdf_source):
+    """
+    Page count of a PDF without extracting anything (the catalog's count,
+    or the page tree when the catalog doesn't declare one)
+    """
+    import pdfplumber
+
+    if hasattr(pdf_source, "read"):
+        pdf_source = pdf_source.read()
+    with pdfplumber.open(_open_source(pdf_source)) as pdf:
+        declared_pages = _declared_page_count(pdf)
+        return declared_pages if declared_pages is not None else len(pdf.pages)
+
+
+def _extract_pages_low_memory(pdf, max_pages, max_chars, page_time_budget):
+    """
+    Extract pages one at a time without pdf.pages, releasing each page
+    before the next is parsed; stops at max_pages pages or max_chars chars
+
+    Returns (page results, pages seen, chars_truncated, peak RSS bytes)
+    """
+    from pdfminer.pdfpage import PDFPage
+    from pdfplumber.page import Page
+
+    results = []
+    chars = 0
+    chars_truncated = False
+    peak_rss = _rss_bytes()
+    doctop = 0
+    pages_seen = 0
+    for index, page_object in enumerate(PDFPage.create_pages(pdf.doc)):
+        pages_seen = index + 1
+        if max_pages and index >= max_pages:
+            break
+        if max_chars and chars >= max_chars:
+            chars_truncated = True
+            break
+        started = time.perf_counter()
+        page = Page(pdf, page_object, page_number=index + 1, initial_doctop=doctop)
+        doctop += page.height
+        text = page.extract_text() or ""
+        peak_rss = max(peak_rss, _rss_bytes())
+        page.close()
+        del page
+        seconds = time.perf_counter() - started
+
+        status = "ok" if text else "empty"
+        if page_time_budget and seconds > page_time_budget:
+            status = "over_budget"
+        results.append((index, text, seconds, status))
+        chars += len(text) + 1
+    return results, pages_seen, chars_truncated, peak_rss
+
+
+def extract_pdf(pdf_source, max_pages=None, page_time_budget=None, workers=None, max_chars=None, low_memory=None):
+    """
+    Extract text from a PDF page by page
+
+    pdf_source: file path, raw PDF bytes, or a binary file-like object
+    workers: pool chunks to split the pages into (1 = extract inline)
+    low_memory: force low-memory mode on or off (None = decide by size)
+
+    Returns dict with "text" and the extraction report:
+    mode, page_count, pages_extracted, truncated, chars_truncated,
+    total_seconds, pages, and memory in low-memory mode
+    """
+    if max_pages is None:
+        max_pages = PDF_MAX_PAGES
+    if page_time_budget is None:
+        page_time_budget = PDF_PAGE_TIME_BUDGET
+    if workers is None:
+        workers = PDF_EXTRACT_WORKERS
+    if max_chars is None:
+        max_chars = PDF_MAX_CHARS
+
+    import pdfplumber
+
+    # File objects cannot be shipped to worker processes
+    if hasattr(pdf_source, "read"):
+        pdf_source = pdf_source.read()
+
+    started = time.perf_counter()
+    page_results = []
+    memory = None
+    chars_truncated = False
+
+    with pdfplumber.open(_open_source(pdf_source)) as pdf:
+        declared_pages = _declared_page_count(pdf)
+        if low_memory is None:
+            low_memory = _source_size(pdf_source) >= PDF_LOW_MEMORY_BYTES or (declared_pages or 0) > PDF_LOW_MEMORY_PAGES
+
+        if low_memory:
+            start_rss = _rss_bytes()
+            page_results, pages_seen, chars_truncated, peak_rss = _extract_pages_low_memory(
+                pdf, max_pages, max_chars, page_time_budget
+            )
+            page_count = declared_pages or pages_seen
+            indices = [index for index, _, _, _ in page_results]
+            memory = {"start_rss_bytes": start_rss, "peak_rss_bytes": peak_rss, "peak_growth_bytes": max(peak_rss - start_rss, 0)}
+            inline = True
+        else:
+            page_count = len(pdf.pages)
+            indices = list(range(min(page_count, max_pages) if max_pages else page_count))
+
+            inline = workers <= 1 or len(indices) < PDF_PARALLEL_MIN_PAGES
+            if inline:
+                page_results = _extract_pages(pdf, indices, page_time_budget)
+
+    if not inline:
+        pool = get_page_pool()
+        submitted = []
+        for chunk in _chunk(indices, workers):
+            # Wall clock: the deadline is checked in the worker process
+            deadline = time.time() + _CHUNK_OPEN_GRACE + page_time_budget * len(chunk) if page_time_budget else None
+            submitted.append((chunk, deadline, pool.submit(_extract_page_range, pdf_source, chunk, page_time_budget, deadline)))
+        for chunk, deadline, future in submitted:
+            try:
+                timeout = max(deadline - time.time(), 0) + _CHUNK_RETURN_GRACE if deadline else None
+                page_results.extend(future.result(timeout=timeout))
+            except FutureTimeoutError:
+                # Only stops a chunk still queued; a running one ends after its current page
+                future.cancel()
+                page_results.extend(_timed_out(chunk))
+
+    page_results.sort(key=lambda result: result[0])
+
+    text = "".join(text + "\n" for _, text, _, _ in page_results if text)
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars]
+        chars_truncated = True
+
+    report = {
+        "text": text,
+        "mode": "low_memory" if low_memory else "standard",
+        "page_count": page_count,
+        "pages_extracted": sum(1 for result in page_results if result[3] != "timed_out"),
+        "truncated": len(indices) < page_count,
+        "chars_truncated": chars_truncated,
+        "total_seconds": round(time.perf_counter() - started, 4),
+        "pages": [
+            {
+                "page": index + 1,
+                "seconds": round(seconds, 4) if seconds is not None else None,
+                "chars": len(text),
+                "status": status,
+            }
+            for index, text, seconds, status in page_results
+        ],
+    }
+    if memory is not None:
+        report["memory"] = memory
+    return report
@@ -0,0 +1,122 @@
+"""
+Cache of complete /analyze responses
+
+Keyed by (SHA-256 of the PDF bytes, job_description_id of the JD,
+scoring version), so a refreshed page, a second recruiter view or a
+retried webhook gets the stored response instead of a full re-analysis.
+
+- scoring_version(): hash of the taxonomy version, the 7-factor
+  weights, the similarity model in use and the extraction limits
+  (PDF_MAX_PAGES, PDF_MAX_CHARS). Every key embeds it, so a taxonomy
+  reload, a weight change, a refitted model or a new limit invalidates
+  older entries automatically (they are dropped on the next lookup)
+- entries expire RESPONSE_CACHE_TTL seconds after they were stored and
+  at most RESPONSE_CACHE_SIZE are kept, least recently used evicted first
+- etag(): strong ETag value (unquoted) for a key. A complete response
+  is a function of the key, so If-None-Match can be answered with 304
+  without a cache entry. Responses built from an extraction with
+  timed-out pages are partial: the routes neither cache nor tag them
+
+Per process and in memory, like the extraction cache's memory tier.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from aggregates import job_description_id
+from comprehensive_scorer import ComprehensiveScorer
+from similarity import similarity_model_version
+from taxonomy import get_taxonomy
+import pdf_extraction
+
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", 256))
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", 600))
+
+
+def scoring_version():
+    """Version of everything a response depends on besides its inputs"""
+    weights = ",".join(f"{factor}={weight!r}" for factor, weight in sorted(ComprehensiveScorer.WEIGHTS.items()))
+    limits = f"{pdf_extraction.PDF_MAX_PAGES},{pdf_extraction.PDF_MAX_CHARS}"
+    version = f"{get_taxonomy().version}|{weights}|{similarity_model_version()}|{limits}"
+    return hashlib.sha256(version.encode("utf-8")).hexdigest()[:12]
+
+
+def response_key(pdf_hash, job_description):
+    """Cache key of one resume (PDF SHA-256) scored against one JD text"""
+    return f"{pdf_hash}:{job_description_id(job_description)}:{scoring_version()}"
+
+
+def etag(key):
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+class ResponseCache:
+    """TTL + LRU cache of /analyze response dicts"""
+
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = RESPONSE_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl = RESPONSE_CACHE_TTL if ttl is None else ttl
+        self._entries = OrderedDict()  # key -> (stored_at, response)
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key):
+        """Stored response for key, or None if absent or expired"""
+        now = time.monotonic()
+        with self._lock:
+            self._drop_stale_version(key)
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, response):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._drop_stale_version(key)
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "scoring_version": self._version,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _drop_stale_version(self, key):
+        # Caller holds the lock; entries from an older scoring version can never be hit again
+        version = key.rsplit(":", 1)[-1]
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+
+response_cache = ResponseCache()
@@ -1,119 +1,97 @@
-import pdfplumber
 import re
 
-def extract_text_from_pdf(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            if page.extract_text():
-                text += page.extract_text() + "\n"
-    return text
+from analysis_context import AnalysisContext, as_context
+from pdf_extraction import extract_pdf
+from skill_extractor import extract_skills, skill_usage
+from skill_matcher import SkillMatcher
+
+
+def extract_text_from_pdf(pdf_source, max_pages=None, page_time_budget=None, workers=None, max_chars=None, low_memory=None):
+    """
+    Extract text from a PDF
+    pdf_source: file path, raw PDF bytes, or a binary file-like object
+
+    See pdf_extraction.extract_pdf for the page and character caps,
+    per-page time budget, worker and low-memory options; use extract_pdf
+    directly for per-page timings.
+    """
+    return extract_pdf(
+        pdf_source, max_pages=max_pages, page_time_budget=page_time_budget, workers=workers,
+        max_chars=max_chars, low_memory=low_memory,
+    )["text"]
 
 
 def parse_resume_sections(resume_text):
     """
     Parse resume into sections: skills, projects, experience, education
     Returns dict with extracted sections for deeper analysis
+
+    The pipeline keeps an AnalysisContext (section offsets) instead; this
+    is the copied-substring view of the same split.
     """
-    text_lower = resume_text.lower()
-    
-    # Section headers to look for (common patterns)
-    section_markers = {
-        "skills": r"(skills|technical skills|languages|technologies|proficiencies)",
-        "projects": r"(projects|portfolio|work samples|applications)",
-        "experience": r"(experience|professional experience|work experience|job history|employment)",
-        "education": r"(education|academic|degree|university|college)",
-    }
-    
-    sections = {
-        "skills": "",
-        "projects": "",
-        "experience": "",
-        "education": "",
-        "other": ""
-    }
-    
-    # Find section positions
-    section_positions = {}
-    for section_name, pattern in section_markers.items():
-        match = re.search(pattern, text_lower)
-        if match:
-            section_positions[section_name] = match.start()
-    
-    # Extract text for each section
-    if section_positions:
-        sorted_sections = sorted(section_positions.items(), key=lambda x: x[1])
-        
-        for i, (section_name, pos) in enumerate(sorted_sections):
-            start = pos
-            # Find end position (start of next section or end of text)
-            if i + 1 < len(sorted_sections):
-                end = sorted_sections[i + 1][1]
-            else:
-                end = len(resume_text)
-            
-            sections[section_name] = resume_text[start:end]
-    else:
-        sections["other"] = resume_text
-    
-    return sections
+    return as_context(resume_text).sections
+
+
+# Action verbs indicating skill usage (matched as token prefixes)
+USAGE_VERBS = (
+    "build", "built", "develop", "developed", "implement", "implemented",
+    "create", "created", "design", "designed", "deploy", "deployed",
+    "manage", "managed", "optimize", "optimized", "write", "wrote",
+    "engineer", "engineered", "architect", "architected", "lead", "led",
+    "maintain", "maintained", "test", "tested", "debug", "debugged"
+)
 
 
 def detect_skill_depth(resume_sections):
     """
     Detect if skills are just listed or actually used in projects/experience
+    resume_sections: AnalysisContext or parse_resume_sections() dict
     Returns dict mapping skills to depth level: 'used' or 'listed'
     """
-    # Action verbs indicating skill usage
-    action_verbs = [
-        "build", "built", "develop", "developed", "implement", "implemented",
-        "create", "created", "design", "designed", "deploy", "deployed",
-        "manage", "managed", "optimize", "optimized", "write", "wrote",
-        "engineer", "engineered", "architect", "architected", "lead", "led",
-        "maintain", "maintained", "test", "tested", "debug", "debugged"
-    ]
-    
-    depth_map = {}
-    
-    # Check projects and experience for skill usage
-    context_text = (resume_sections.get("projects", "") + " " + 
-                    resume_sections.get("experience", "")).lower()
-    
-    skills_section = resume_sections.get("skills", "").lower()
-    
-    # If skill appears with action verb in projects/experience, it's "used"
-    # If only in skills section, it's "listed"
-    # This is a simple heuristic
-    
-    return depth_map
+    context = as_context(resume_sections)
+
+    # If skill appears near an action verb in projects/experience, it's "used";
+    # anywhere else (skills list, or projects without a verb) it's "listed"
+    usage = skill_usage(context, extract_skills(context), USAGE_VERBS)
+    return {
+        skill: "used" if depth == "used" else "listed"
+        for skill, depth in usage.items()
+    }
+
+
+EXPERIENCE_SECTIONS = ("experience", "education")
+YEARS_PATTERN = re.compile(r"(\d+)\+?\s*years")
 
 
 def extract_experience_level(resume_sections):
     """
     Detect experience level: internship, junior, mid, senior
+    resume_sections: AnalysisContext or parse_resume_sections() dict
     Returns: 'internship', 'junior', 'mid', 'senior'
     """
-    experience_text = (resume_sections.get("experience", "") + " " +
-                      resume_sections.get("education", "")).lower()
-    
+    context = as_context(resume_sections)
+
+    def mentions(keywords):
+        return any(context.contains(kw, EXPERIENCE_SECTIONS) for kw in keywords)
+
     # Senior indicators
-    if any(kw in experience_text for kw in ["senior", "lead", "manager", "architect", "principal"]):
+    if mentions(["senior", "lead", "manager", "architect", "principal"]):
         return "senior"
     
     # Mid indicators
-    elif any(kw in experience_text for kw in ["mid-level", "intermediate", "years", "6+ years", "5+ years"]):
+    elif mentions(["mid-level", "intermediate", "years", "6+ years", "5+ years"]):
         return "mid"
     
     # Junior indicators
-    elif any(kw in experience_text for kw in ["junior", "associate", "2 years", "3 years", "recent", "graduate"]):
+    elif mentions(["junior", "associate", "2 years", "3 years", "recent", "graduate"]):
         return "junior"
     
     # Internship indicators
-    elif any(kw in experience_text for kw in ["internship", "intern", "gpa", "coursework", "projects only"]):
+    elif mentions(["internship", "intern", "gpa", "coursework", "projects only"]):
         return "internship"
     
     # Default based on years of experience mentioned
-    years_match = re.search(r"(\d+)\+?\s*years", experience_text)
+    years_match = context.search(YEARS_PATTERN, EXPERIENCE_SECTIONS)
     if years_match:
         years = int(years_match.group(1))
         if years >= 7:
@@ -126,36 +104,75 @@ def extract_experience_level(resume_sections):
     return "junior"  # Default
 
 
-def detect_domain_context(resume_sections, job_description=""):
+# Domain keywords
+DOMAIN_PATTERNS = {
+    "web": ["frontend", "backend", "react", "nodejs", "express", "api", "rest", "http"],
+    "data": ["data", "sql", "database", "analytics", "visualization", "etl", "pipeline"],
+    "ml": ["machine learning", "neural", "tensorflow", "sklearn", "prediction", "training"],
+    "mobile": ["mobile", "ios", "android", "flutter", "react native"],
+    "devops": ["docker", "kubernetes", "ci/cd", "jenkins", "deployment", "infrastructure"],
+}
+
+
+DOMAIN_NAMES = tuple(DOMAIN_PATTERNS)
+
+
+def _keyword_domains():
+    keyword_domains = {}
+    for index, keywords in enumerate(DOMAIN_PATTERNS.values()):
+        for keyword in keywords:
+            keyword_domains.setdefault(keyword, []).append(index)
+    return keyword_domains
+
+
+# Every domain keyword in one precompiled (boundary-aware) matcher
+_DOMAIN_MATCHER = SkillMatcher([kw for keywords in DOMAIN_PATTERNS.values() for kw in keywords])
+_KEYWORD_DOMAINS = _keyword_domains()
+
+
+def domain_profile(text):
+    """
+    Per-domain keyword counts (distinct keywords found), ordered like
+    DOMAIN_NAMES, from one matcher pass
+    text: already-lowercased text, or an AnalysisContext (its sections)
+    """
+    if isinstance(text, AnalysisContext):
+        spans = text.section_spans
+        found = set()
+        for start, end in spans.values():
+            found.update(term for _, _, term in _DOMAIN_MATCHER.finditer(text.text_lower, start, end))
+    else:
+        found = _DOMAIN_MATCHER.find_terms(text)
+
+    profile = [0] * len(DOMAIN_NAMES)
+    for keyword in found:
+        for index in _KEYWORD_DOMAINS[keyword]:
+            profile[index] += 1
+    return tuple(profile)
+
+
+def domain_relevance(resume_profile, jd_profile):
+    """
+    Relevance 0-100 of a resume domain profile to a JD profile: the share
+    of the JD's domain keywords the resume matches domain by domain
+    """
+    jd_total = sum(jd_profile)
+    if jd_total == 0:
+        return 50  # Neutral if can't determine
+    overlap = sum(min(resume_count, jd_count) for resume_count, jd_count in zip(resume_profile, jd_profile))
+    return (overlap / jd_total) * 100
+
+
+def detect_domain_context(resume_sections, job_description="", jd_domain_profile=None):
     """
     Detect if candidate has worked in related domain
+    resume_sections: AnalysisContext or parse_resume_sections() dict
     Returns relevance score 0-100
+
+    jd_domain_profile: precomputed domain_profile() of the job
+    description, so batch callers only scan the JD once
     """
-    resume_text = " ".join(resume_sections.values()).lower()
-    jd_text = job_description.lower()
-    
-    # Domain keywords
-    domain_patterns = {
-        "web": ["frontend", "backend", "react", "nodejs", "express", "api", "rest", "http"],
-        "data": ["data", "sql", "database", "analytics", "visualization", "etl", "pipeline"],
-        "ml": ["machine learning", "neural", "tensorflow", "sklearn", "prediction", "training"],
-        "mobile": ["mobile", "ios", "android", "flutter", "react native"],
-        "devops": ["docker", "kubernetes", "ci/cd", "jenkins", "deployment", "infrastructure"],
-    }
-    
-    # Simple scoring: count domain keyword matches
-    resume_domain_matches = 0
-    jd_domain_matches = 0
-    
-    for domain, keywords in domain_patterns.items():
-        for keyword in keywords:
-            if keyword in resume_text:
-                resume_domain_matches += 1
-            if keyword in jd_text:
-                jd_domain_matches += 1
-    
-    if jd_domain_matches == 0:
-        return 50  # Neutral if can't determine
-    
-    relevance = (resume_domain_matches / jd_domain_matches) * 100
-    return min(relevance, 100)
+    resume_domain_profile = domain_profile(as_context(resume_sections))
+    if jd_domain_profile is None:
+        jd_domain_profile = domain_profile(job_description.lower())
+    return domain_relevance(resume_domain_profile, jd_domain_profile)
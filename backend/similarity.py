@@ -1,8 +1,183 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+"""
+Text similarity (Layer 3)
 
-def calculate_similarity(resume_text, jd_text):
+Two engines:
+- SimilarityModel: TF-IDF vocabulary and IDF fitted on a corpus of past
+  resumes and JDs, saved with joblib and loaded once per worker; request
+  time is transform-only
+- HashingSimilarityModel: vocabulary-free hashing features with running
+  document frequencies, so partial_fit() keeps learning without a refit
+
+calculate_similarity() uses the model at SIMILARITY_MODEL_PATH when one
+exists and falls back to fitting TF-IDF on the two documents otherwise.
+
+scikit-learn, NumPy and joblib are imported on first use, not with this
+module (see warmup.py).
+
+Fit or update a model from text/PDF files:
+    python similarity.py fit model.joblib docs/*.txt
+    python similarity.py fit --hashing model.joblib docs/*.pdf
+    python similarity.py update model.joblib new_docs/*.pdf
+"""
+
+import os
+import sys
+
+SIMILARITY_MODEL_PATH = os.environ.get("SIMILARITY_MODEL_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "similarity_model.joblib")
+
+
+class SimilarityModel:
+    """TF-IDF model with a corpus-fitted vocabulary and IDF"""
+
+    def __init__(self, vectorizer):
+        self.vectorizer = vectorizer
+
+    @classmethod
+    def fit(cls, documents):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+        vectorizer.fit(documents)
+        return cls(vectorizer)
+
+    def transform(self, texts):
+        """L2-normalised sparse TF-IDF rows"""
+        return self.vectorizer.transform(texts)
+
+    def features(self, texts):
+        """
+        Rows to store for texts that are compared later: weigh() turns
+        them into transform() rows with the model as it is then
+        The IDF is fixed at fit time, so these are the transform() rows
+        """
+        return self.transform(texts)
+
+    def weigh(self, features):
+        """features() rows as transform() rows"""
+        return features
+
+    def similarity(self, text, other_vector):
+        """Cosine similarity (0-100) between a text and an already transformed vector"""
+        vector = self.transform([text])
+        return round(float(vector.multiply(other_vector).sum()) * 100, 2)
+
+    def save(self, path):
+        import joblib
+
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        import joblib
+
+        return joblib.load(path)
+
+
+class HashingSimilarityModel(SimilarityModel):
+    """Incrementally trainable TF-IDF over hashed features"""
+
+    def __init__(self, n_features=2 ** 18):
+        import numpy as np
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        super().__init__(HashingVectorizer(
+            stop_words='english', n_features=n_features,
+            alternate_sign=False, norm=None,
+        ))
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    @classmethod
+    def fit(cls, documents):
+        model = cls()
+        model.partial_fit(documents)
+        return model
+
+    def partial_fit(self, documents):
+        """Fold more documents into the document frequencies"""
+        return self.partial_fit_features(self.features(documents))
+
+    def partial_fit_features(self, counts):
+        """partial_fit() for documents already turned into features()"""
+        import numpy as np
+
+        present = counts.copy()
+        present.data[:] = 1
+        self.doc_freq += np.asarray(present.sum(axis=0)).ravel().astype(np.int64)
+        self.n_docs += present.shape[0]
+        return self
+
+    def transform(self, texts):
+        return self.weigh(self.features(texts))
+
+    def features(self, texts):
+        """
+        Raw hashed term counts: the IDF keeps changing with partial_fit(),
+        so stored documents are weighed when they are compared, not before
+        """
+        return self.vectorizer.transform(texts)
+
+    def weigh(self, counts):
+        """Term counts -> L2-normalised TF-IDF rows with the current IDF"""
+        import numpy as np
+        from sklearn.preprocessing import normalize
+
+        counts = counts.astype(np.float64)
+        # Smoothed IDF, same formula as TfidfVectorizer
+        idf = np.log((1 + self.n_docs) / (1 + self.doc_freq[counts.indices])) + 1
+        counts.data = (1 + np.log(counts.data)) * idf  # sublinear tf, as SimilarityModel
+        return normalize(counts)
+
+
+_model = None
+_model_loaded = False
+_model_file_version = None
+
+
+def get_similarity_model():
+    """The per-worker model from SIMILARITY_MODEL_PATH, or None if there isn't one"""
+    global _model, _model_loaded, _model_file_version
+    if not _model_loaded:
+        if os.path.exists(SIMILARITY_MODEL_PATH):
+            stat = os.stat(SIMILARITY_MODEL_PATH)
+            _model = SimilarityModel.load(SIMILARITY_MODEL_PATH)
+            _model_file_version = f"{stat.st_mtime_ns}-{stat.st_size}"
+        _model_loaded = True
+    return _model
+
+
+def similarity_model_version():
+    """
+    Identity of the model calculate_similarity() uses: "none" without one,
+    else its file's mtime and size when loaded, plus the document count of
+    a hashing model (a CandidateIndex sharing it keeps updating it)
+    """
+    model = get_similarity_model()
+    if model is None:
+        return "none"
+    return f"{_model_file_version}-{getattr(model, 'n_docs', 0)}"
+
+
+def job_similarity_vector(jd_text):
+    """Transform a JD once for reuse across resumes (None without a model)"""
+    model = get_similarity_model()
+    if model is None:
+        return None
+    return model.transform([jd_text])
+
+
+def calculate_similarity(resume_text, jd_text, jd_vector=None):
     """Calculate TF-IDF cosine similarity (used for Layer 3 - text similarity bonus)"""
+    model = get_similarity_model()
+    if model is not None:
+        if jd_vector is None:
+            jd_vector = model.transform([jd_text])
+        return model.similarity(resume_text, jd_vector)
+
+    # No fitted model: fall back to fitting on the two documents
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     documents = [resume_text, jd_text]
 
     vectorizer = TfidfVectorizer(stop_words='english')
@@ -53,3 +228,49 @@ def calculate_comprehensive_score(matched_skills, job_skills, bonus_skills, text
         "text_similarity_score": round(text_similarity_score, 2),
         "final_score": round(final_score, 2)
     }
+
+
+def _read_documents(paths):
+    from resume_parser import extract_text_from_pdf
+
+    for path in paths:
+        if path.lower().endswith(".pdf"):
+            yield extract_text_from_pdf(path)
+        else:
+            with open(path, "r", encoding="utf-8", errors="ignore") as text_file:
+                yield text_file.read()
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fit or update the text similarity model")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fit_parser = subparsers.add_parser("fit", help="Fit a new model on a corpus")
+    fit_parser.add_argument("--hashing", action="store_true", help="Fit an incrementally updatable hashing model")
+    fit_parser.add_argument("model_path")
+    fit_parser.add_argument("documents", nargs="+")
+
+    update_parser = subparsers.add_parser("update", help="Fold new documents into a hashing model")
+    update_parser.add_argument("model_path")
+    update_parser.add_argument("documents", nargs="+")
+
+    args = parser.parse_args(argv)
+    documents = list(_read_documents(args.documents))
+
+    if args.command == "fit":
+        model_class = HashingSimilarityModel if args.hashing else SimilarityModel
+        model = model_class.fit(documents)
+    else:
+        model = SimilarityModel.load(args.model_path)
+        if not isinstance(model, HashingSimilarityModel):
+            parser.error("only --hashing models can be updated; refit TF-IDF models instead")
+        model.partial_fit(documents)
+
+    model.save(args.model_path)
+    print(f"Saved {type(model).__name__} ({len(documents)} documents) to {args.model_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,90 +1,121 @@
-# Skill synonyms for normalization (LEVEL 1: Synonym Engine)
-SKILL_SYNONYMS = {
-    "js": "javascript",
-    "html5": "html",
-    "css3": "css",
-    "ml": "machine learning",
-    "deep learning": "machine learning",
-    "nlp": "machine learning",
-    "data science": "machine learning",
-    "ai": "machine learning",
-    "java script": "javascript",
-    "react.js": "react",
-    "nodejs": "node",
-    "node.js": "node",
-    "postgres": "sql",
-    "postgresql": "sql",
-    "nosql": "database",
-    "mongodb": "database",
-    "frontend": "html",
-    "backend": "python",
-    "rest": "apis",
-    "api": "apis",
-    "expressjs": "javascript",
-    "express.js": "javascript",
-}
-
-# Role-aware skill classification (LEVEL 1: Role Weighting)
-ROLE_SKILL_MAP = {
-    "frontend": ["javascript", "react", "html", "css"],
-    "backend": ["python", "java", "flask", "django", "sql", "database", "apis"],
-    "full-stack": ["javascript", "react", "python", "flask", "sql", "html", "css"],
-    "ml": ["python", "machine learning", "nlp", "data structures", "algorithms"],
-}
-
-# Core skills by role (important for confidence-aware labels)
-CORE_SKILLS_BY_ROLE = {
-    "frontend": ["javascript", "html", "css"],
-    "backend": ["python", "sql"],
-    "full-stack": ["javascript", "python", "sql"],
-    "ml": ["python", "machine learning"],
-}
+from bisect import bisect_left
+
+# Skills, synonyms (LEVEL 1: Synonym Engine), role skill maps (LEVEL 1:
+# Role Weighting) and core skills by role (confidence-aware labels) live in
+# the taxonomy data file; see taxonomy.py
+from analysis_context import AnalysisContext, any_within
+from taxonomy import get_taxonomy
+
+# Sections where a skill counts as used rather than listed, and how close
+# (in characters) an action verb has to be
+USAGE_SECTIONS = ("projects", "experience")
+USAGE_WINDOW = 500
+
+
+def _lowered(text):
+    # An AnalysisContext has already normalized the text once
+    return text.text_lower if isinstance(text, AnalysisContext) else text.lower()
 
 
 def normalize_skill(skill):
     """Normalize skill using synonym map"""
-    normalized = SKILL_SYNONYMS.get(skill.lower(), skill.lower())
+    taxonomy = get_taxonomy()
+    skill_lower = skill.lower()
+    normalized = taxonomy.canonical.get(skill_lower)
+    if normalized is None:
+        normalized = taxonomy.synonyms.get(skill_lower, skill_lower)
     return normalized.strip()
 
 
-def extract_skills(text):
-    skills_list = [
-        "python", "java", "sql", "mysql", "database",
-        "machine learning", "deep learning", "nlp", "data science", "ai",
-        "data structures", "algorithms",
-        "html", "css", "javascript", "react", "node",
-        "flask", "django", "apis", "rest",
-        "git"
+def extract_skill_matches(text):
+    """
+    Find every skill occurrence in one pass over the text
+    text: string or AnalysisContext
+    Returns list of (start, end, normalized_skill), ordered by position
+    """
+    taxonomy = get_taxonomy()
+    return [
+        (start, end, taxonomy.canonical[term])
+        for start, end, term in taxonomy.matcher.find_all(_lowered(text))
     ]
 
-    text = text.lower()
-    found_skills = []
 
-    for skill in skills_list:
-        if skill in text:
-            # Normalize the found skill
-            normalized_skill = normalize_skill(skill)
-            found_skills.append(normalized_skill)
+def _context_matches(context):
+    """(start, normalized_skill) for every occurrence, one matcher pass per context"""
+    taxonomy = get_taxonomy()
+    return context.cached(("skill_matches", taxonomy.version), lambda: [
+        (start, taxonomy.canonical[term])
+        for start, _, term in taxonomy.matcher.finditer(context.text_lower)
+    ])
+
+
+def skill_positions(context, names):
+    """
+    Positional index of skills inside the named sections of an
+    AnalysisContext: normalized skill -> sorted start offsets
+    """
+    def build():
+        matches = _context_matches(context)
+        starts = [start for start, _ in matches]
+        positions = {}
+        spans = context.section_spans
+        for span_start, span_end in sorted(spans[name] for name in names if name in spans):
+            for start, skill in matches[bisect_left(starts, span_start):bisect_left(starts, span_end)]:
+                positions.setdefault(skill, []).append(start)
+        return positions
+
+    return context.cached(("skill_positions", get_taxonomy().version) + tuple(names), build)
+
+
+def skill_usage(context, skills, action_verbs, window=USAGE_WINDOW):
+    """
+    How each skill shows up in the projects/experience sections:
+    'used' (an action verb within window chars of any occurrence),
+    'mentioned' (present, no verb nearby) or None (absent)
+    """
+    verb_positions = context.prefix_positions(action_verbs, *USAGE_SECTIONS)
+    positions = skill_positions(context, USAGE_SECTIONS)
+    usage = {}
+    for skill in skills:
+        offsets = positions.get(skill)
+        if not offsets:
+            usage[skill] = None
+        elif any_within(offsets, verb_positions, window):
+            usage[skill] = "used"
+        else:
+            usage[skill] = "mentioned"
+    return usage
+
+
+def extract_skills(text):
+    """Deduplicated normalized skills in a string or AnalysisContext"""
+    if isinstance(text, AnalysisContext):
+        # Shares the matcher pass with skill_positions()
+        return list({skill for _, skill in _context_matches(text)})
+    taxonomy = get_taxonomy()
+    found_skills = {taxonomy.canonical[term] for term in taxonomy.matcher.find_terms(text.lower())}
 
-    # Remove duplicates and return
-    return list(set(found_skills))
+    # Deduplicated normalized skills
+    return list(found_skills)
 
 
 def detect_job_role(job_skills):
     """
     Detect the primary job role based on skills (LEVEL 1: Role Detection)
+    job_skills: skill names, or their Taxonomy.mask() bitmap
     Returns: frontend, backend, full-stack, or ml
     """
-    job_skills_set = set(job_skills)
+    taxonomy = get_taxonomy()
+    job_mask = job_skills if isinstance(job_skills, int) else taxonomy.mask(job_skills)
     
+    # Overlap with each role's precompiled skill bitmap
     role_scores = {
-        "frontend": len(job_skills_set & set(ROLE_SKILL_MAP["frontend"])),
-        "backend": len(job_skills_set & set(ROLE_SKILL_MAP["backend"])),
-        "ml": len(job_skills_set & set(ROLE_SKILL_MAP["ml"])),
+        role: (job_mask & taxonomy.role_masks[role]).bit_count()
+        for role in taxonomy.scored_roles
     }
     
     # Detect full-stack if both frontend and backend skills present
-    if role_scores["frontend"] >= 2 and role_scores["backend"] >= 2:
+    if role_scores.get("frontend", 0) >= 2 and role_scores.get("backend", 0) >= 2:
         return "full-stack"
     
     # Return role with highest score
@@ -99,6 +130,7 @@ def get_critical_missing_skills(missing_skills, detected_role):
     """
     Get core/critical missing skills for the detected role (LEVEL 1: Confidence)
     """
-    core_skills = CORE_SKILLS_BY_ROLE.get(detected_role, [])
-    critical = [skill for skill in missing_skills if skill in core_skills]
-    return critical
+    taxonomy = get_taxonomy()
+    missing_mask, _ = taxonomy.split_mask(missing_skills)
+    # Core skills are always in the taxonomy, so unknown names can't be critical
+    return taxonomy.skills_from_mask(missing_mask & taxonomy.core_masks.get(detected_role, 0))
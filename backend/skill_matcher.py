@@ -0,0 +1,112 @@
+"""
+Single-pass multi-pattern skill matcher
+
+All skill terms are compiled once into one regex built from a character
+trie, so matching costs one scan of the text regardless of taxonomy
+size (Python's re does not factor plain alternations, a trie pattern
+keeps each position down to a few character tests).
+
+Matches are boundary-aware: a term only matches when it is not glued to
+other letters or digits, so "ai" no longer hits inside "maintain" and
+"java" no longer hits inside "javascript". Shorter terms nested inside
+a longer match ("react" in "react native") are reported as well.
+"""
+
+import re
+
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+
+def _build_trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+    return trie
+
+
+def _trie_pattern(node):
+    """Regex for a trie node; optional tails are greedy so longer terms win"""
+    alternatives = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char != ""
+    ]
+    if not alternatives:
+        return ""
+    if len(alternatives) == 1:
+        body = alternatives[0]
+    else:
+        body = "(?:" + "|".join(alternatives) + ")"
+    if "" in node:
+        return "(?:" + body + ")?"
+    return body
+
+
+def trie_pattern(terms):
+    """Regex source matching any of terms, factored through a character trie"""
+    return _trie_pattern(_build_trie(terms))
+
+
+def _is_boundary(text, start, end):
+    """True when text[start:end] is not glued to word characters"""
+    before_ok = start == 0 or text[start - 1] not in _WORD_CHARS
+    after_ok = end == len(text) or text[end] not in _WORD_CHARS
+    return before_ok and after_ok
+
+
+class SkillMatcher:
+    """Compiled matcher over a fixed set of lowercase skill terms"""
+
+    def __init__(self, terms):
+        self.terms = frozenset(term.lower().strip() for term in terms if term.strip())
+
+        if self.terms:
+            body = trie_pattern(self.terms)
+            self._pattern = re.compile(r"(?<![a-z0-9])" + body + r"(?![a-z0-9])")
+        else:
+            self._pattern = None
+
+        # Terms that occur whole inside a longer term, with their offsets
+        self._nested = {}
+        for term in self.terms:
+            nested = self._find_nested(term)
+            if nested:
+                self._nested[term] = nested
+
+    def _find_nested(self, term):
+        starts = [i for i in range(len(term)) if i == 0 or term[i - 1] not in _WORD_CHARS]
+        nested = []
+        for start in starts:
+            for end in range(start + 1, len(term) + 1):
+                if (start, end) == (0, len(term)):
+                    continue
+                candidate = term[start:end]
+                if candidate in self.terms and _is_boundary(term, start, end):
+                    nested.append((start, end, candidate))
+        return tuple(nested)
+
+    def finditer(self, text, pos=0, endpos=None):
+        """
+        Yield (start, end, term) for every skill occurrence
+        text must already be lowercased; pos/endpos limit the scan to
+        text[pos:endpos] without copying it (offsets stay absolute)
+        """
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text, pos, len(text) if endpos is None else endpos):
+            start, end = match.span()
+            term = match.group()
+            yield start, end, term
+            for offset_start, offset_end, nested_term in self._nested.get(term, ()):
+                yield start + offset_start, start + offset_end, nested_term
+
+    def find_all(self, text):
+        """All (start, end, term) occurrences, ordered by position"""
+        return sorted(self.finditer(text))
+
+    def find_terms(self, text):
+        """Set of distinct terms present in text"""
+        return {term for _, _, term in self.finditer(text)}
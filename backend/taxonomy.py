@@ -0,0 +1,204 @@
+"""
+Skill taxonomy subsystem
+
+Skills, synonyms, roles, core skills and suggestion text are loaded
+from a JSON data file (TAXONOMY_PATH, default taxonomy.json next to this
+module) and compiled once into a frozen Taxonomy:
+- interned skill-ID table (skill name <-> integer ID)
+- role and core-skill bitmaps over those IDs
+- synonym/canonical maps and the compiled SkillMatcher
+
+The matcher searches text for the skills and for the synonyms listed in
+spelling_variants (nodejs, html5, ...). Every other synonym (role
+words such as "backend", short keys such as "ml" or "js", related
+products such as "mongodb") only normalizes skill names handed in
+directly: as a search term it would report skills the text never names.
+
+Hot reload: get_taxonomy() re-checks the data file's mtime at most every
+TAXONOMY_RELOAD_INTERVAL seconds and swaps in a freshly compiled
+Taxonomy when it changed, so every worker picks up edits without a
+restart. Readers hold a reference to one immutable Taxonomy, so a swap
+never exposes a half-built state. A broken file keeps the previous
+taxonomy in place.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from skill_matcher import SkillMatcher
+
+TAXONOMY_PATH = os.environ.get("TAXONOMY_PATH") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomy.json")
+TAXONOMY_RELOAD_INTERVAL = float(os.environ.get("TAXONOMY_RELOAD_INTERVAL", 5.0))
+
+REQUIRED_KEYS = ("skills", "synonyms", "roles", "scored_roles", "core_skills_by_role")
+
+logger = logging.getLogger(__name__)
+
+
+class Taxonomy:
+    """Immutable, compiled view of one version of the taxonomy data"""
+
+    def __init__(self, data, version):
+        missing = [key for key in REQUIRED_KEYS if key not in data]
+        if missing:
+            raise ValueError(f"Taxonomy is missing required keys: {', '.join(missing)}")
+
+        self.version = version
+
+        # === MATCHING ===
+        self.skills = tuple(skill.lower().strip() for skill in data["skills"])
+        self.synonyms = MappingProxyType({
+            term.lower().strip(): canonical.lower().strip()
+            for term, canonical in data["synonyms"].items()
+        })
+        self.spelling_variants = tuple(term.lower().strip() for term in data.get("spelling_variants", []))
+        unknown_variants = [term for term in self.spelling_variants if term not in self.synonyms]
+        if unknown_variants:
+            raise ValueError(f"spelling_variants not defined in synonyms: {', '.join(unknown_variants)}")
+        self.matcher = SkillMatcher(self.skills + self.spelling_variants)
+        self.canonical = MappingProxyType({
+            term: self.synonyms.get(term, term)
+            for term in self.matcher.terms
+        })
+
+        # === ROLES & SUGGESTION DATA ===
+        self.role_skills = _freeze_lists(data["roles"])
+        self.scored_roles = tuple(data["scored_roles"])
+        self.core_skills_by_role = _freeze_lists(data["core_skills_by_role"])
+        self.skill_categories = _freeze_lists(data.get("skill_categories", {}))
+        self.secondary_skills = frozenset(data.get("secondary_skills", []))
+        self.skill_actions = MappingProxyType(dict(data.get("skill_actions", {})))
+
+        unknown_roles = [role for role in self.scored_roles if role not in self.role_skills]
+        if unknown_roles:
+            raise ValueError(f"scored_roles not defined in roles: {', '.join(unknown_roles)}")
+
+        # === INTERNED SKILL IDS ===
+        names = set(self.canonical.values()) | set(self.skills) | self.secondary_skills
+        for mapping in (self.role_skills, self.core_skills_by_role, self.skill_categories):
+            for skills in mapping.values():
+                names.update(skills)
+        self.skill_names = tuple(sorted(names))
+        self.skill_ids = MappingProxyType({name: i for i, name in enumerate(self.skill_names)})
+
+        self.role_masks = MappingProxyType({role: self.mask(skills) for role, skills in self.role_skills.items()})
+        self.core_masks = MappingProxyType({role: self.mask(skills) for role, skills in self.core_skills_by_role.items()})
+
+    def skill_id(self, skill):
+        """Interned ID of a skill name, or None if the taxonomy doesn't know it"""
+        return self.skill_ids.get(skill)
+
+    def mask(self, skills):
+        """Bitmap (int) of the known skills in an iterable of skill names"""
+        mask = 0
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
+
+    def split_mask(self, skills):
+        """(bitmap of the known skills, names the taxonomy doesn't know) for an iterable of names"""
+        mask = 0
+        unknown = []
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is None:
+                unknown.append(skill)
+            else:
+                mask |= 1 << skill_id
+        return mask, unknown
+
+    def skills_from_mask(self, mask):
+        """Skill names set in a bitmap, in ID order"""
+        names = []
+        while mask:
+            low_bit = mask & -mask
+            names.append(self.skill_names[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return names
+
+
+def _freeze_lists(mapping):
+    return MappingProxyType({key: tuple(values) for key, values in mapping.items()})
+
+
+def load_taxonomy(path=None):
+    """Read and compile a taxonomy data file"""
+    path = path or TAXONOMY_PATH
+    with open(path, "rb") as taxonomy_file:
+        raw = taxonomy_file.read()
+    data = json.loads(raw.decode("utf-8"))
+    version = hashlib.sha256(raw).hexdigest()[:12]
+    return Taxonomy(data, version)
+
+
+# === CURRENT TAXONOMY (per process) ===
+
+_lock = threading.Lock()
+_current = None
+_current_path = None
+_loaded_mtime = None
+_last_check = 0.0
+
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def reload_taxonomy(path=None):
+    """
+    Compile the data file and atomically swap it in
+    Raises on an unreadable or invalid file; the old taxonomy stays active
+    """
+    global _current, _current_path, _loaded_mtime, _last_check
+    path = path or _current_path or TAXONOMY_PATH
+    mtime = _file_mtime(path)
+    taxonomy = load_taxonomy(path)
+    with _lock:
+        _current = taxonomy
+        _current_path = path
+        _loaded_mtime = mtime
+        _last_check = time.monotonic()
+    return taxonomy
+
+
+def set_taxonomy(taxonomy):
+    """
+    Install an already compiled Taxonomy (benchmarks, experiments)
+    Stays active until the data file changes or reload_taxonomy() is called
+    """
+    global _current, _current_path, _loaded_mtime, _last_check
+    path = _current_path or TAXONOMY_PATH
+    with _lock:
+        _current = taxonomy
+        _current_path = path
+        _loaded_mtime = _file_mtime(path)
+        _last_check = time.monotonic()
+    return taxonomy
+
+
+def get_taxonomy():
+    """The active Taxonomy, reloaded if its data file changed"""
+    global _last_check
+    taxonomy = _current
+    if taxonomy is None:
+        return reload_taxonomy()
+
+    now = time.monotonic()
+    if TAXONOMY_RELOAD_INTERVAL >= 0 and now - _last_check >= TAXONOMY_RELOAD_INTERVAL:
+        _last_check = now
+        if _file_mtime(_current_path) != _loaded_mtime:
+            try:
+                taxonomy = reload_taxonomy()
+            except Exception as exc:
+                logger.warning("Taxonomy reload failed, keeping version %s: %s", taxonomy.version, exc)
+    return taxonomy
@@ -0,0 +1,80 @@
+"""
+Per-request resume upload handling
+
+Uploads are read straight from the request stream into memory and
+handed to extract_text_from_pdf as bytes. Only uploads larger than
+UPLOAD_SPILL_THRESHOLD are spilled to a uniquely named temp file,
+which is removed as soon as the request is done with it.
+
+Streamed responses outlive the request's own upload files (they are
+closed when the view returns), so detach_upload() copies an upload into
+a spooled temp file the response generator owns.
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# Uploads above this size (bytes) are spilled to disk instead of held in memory
+UPLOAD_SPILL_THRESHOLD = int(os.environ.get("UPLOAD_SPILL_THRESHOLD", 10 * 1024 * 1024))
+
+# Detached uploads above this size (bytes) live on disk until read
+UPLOAD_DETACH_MEMORY = int(os.environ.get("UPLOAD_DETACH_MEMORY", 512 * 1024))
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@contextmanager
+def resume_upload_source(resume_file, spill_threshold=None):
+    """
+    Yield a source accepted by extract_text_from_pdf for an uploaded file
+
+    - bytes for uploads up to spill_threshold
+    - a per-request temp file path for larger uploads (deleted on exit)
+    """
+    if spill_threshold is None:
+        spill_threshold = UPLOAD_SPILL_THRESHOLD
+
+    stream = resume_file.stream
+    # Read one byte past the threshold to find out if we must spill
+    head = stream.read(spill_threshold + 1)
+    if len(head) <= spill_threshold:
+        yield head
+        return
+
+    fd, temp_path = tempfile.mkstemp(prefix="resume_", suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(head)
+            del head
+            while True:
+                chunk = stream.read(_COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                temp_file.write(chunk)
+        yield temp_path
+    finally:
+        os.remove(temp_path)
+
+
+def upload_size(upload):
+    """Size in bytes of an uploaded file or detach_upload() copy, read position kept"""
+    stream = getattr(upload, "stream", upload)
+    position = stream.tell()
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(position)
+    return size
+
+
+def detach_upload(resume_file, max_memory=None):
+    """
+    Copy an uploaded file into a spooled temp file that survives the end
+    of the request; the caller reads and closes it
+    """
+    if max_memory is None:
+        max_memory = UPLOAD_DETACH_MEMORY
+    detached = tempfile.SpooledTemporaryFile(max_size=max_memory, prefix="resume_", suffix=".pdf")
+    shutil.copyfileobj(resume_file.stream, detached, _COPY_CHUNK_SIZE)
+    detached.seek(0)
+    return detached
@@ -0,0 +1,164 @@
+"""
+Worker start-up: warm-up hook and import-cost report
+
+Importing app stays cheap: scikit-learn, NumPy/SciPy, joblib and
+pdfplumber are imported where they are first used. warm_up() pays for
+all of it up front instead, building:
+- the heavy imports
+- the taxonomy and its skill matcher
+- the similarity model (SIMILARITY_MODEL_PATH, if present)
+- every lazily compiled pattern and per-taxonomy cache, by running one
+  small analysis end to end
+
+Call it once in the parent before worker processes fork, so they share
+those pages copy-on-write: app.py runs it when WARMUP_ON_IMPORT=1 (for
+gunicorn --preload) and before the development server starts, asgi.py
+at server startup, and bulk_analyze.py before starting its pool.
+Afterwards gc.freeze() moves everything built so far out of the
+collector's reach, so collections in the workers don't touch (and copy)
+those pages.
+
+Import cost of every module, then warm-up stage timings:
+    python warmup.py
+    python warmup.py --top 40 --module bulk_analyze
+"""
+
+import argparse
+import gc
+import logging
+import os
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY_MODULES = (
+    "numpy",
+    "scipy.sparse",
+    "joblib",
+    "sklearn.feature_extraction.text",
+    "sklearn.metrics.pairwise",
+    "sklearn.preprocessing",
+    "pdfplumber",
+    "pdfminer.pdfpage",
+)
+
+_SAMPLE_JOB_DESCRIPTION = (
+    "Backend engineer: Python, Flask, SQL, Docker and AWS. "
+    "Experience with REST APIs, machine learning and data pipelines."
+)
+_SAMPLE_RESUME = (
+    "Jane Doe\njane@example.com | https://example.com\n"
+    "Skills\nPython, Flask, SQL, Docker, React\n"
+    "Projects\n• Built a REST API in Flask and deployed it with Docker on AWS\n"
+    "Experience\nSoftware engineer, 3+ years: developed data pipelines and machine learning models\n"
+    "Education\nB.S. Computer Science, State University\n"
+)
+
+_warmed = False
+
+
+def warm_up(force=False):
+    """
+    Build everything workers would otherwise build on first request
+    Returns seconds per warm-up stage; later calls are no-ops unless forced
+    """
+    global _warmed
+    if _warmed and not force:
+        return {}
+
+    stage_seconds = {}
+
+    def timed(stage, build):
+        started = time.perf_counter()
+        build()
+        stage_seconds[stage] = round(time.perf_counter() - started, 4)
+
+    def import_heavy_modules():
+        import importlib
+        for module in HEAVY_MODULES:
+            importlib.import_module(module)
+
+    def analyze_sample():
+        from analysis_pipeline import prepare_job_description, analyze_resume_text
+        analyze_resume_text(_SAMPLE_RESUME, prepare_job_description(_SAMPLE_JOB_DESCRIPTION))
+
+    from taxonomy import get_taxonomy
+    from similarity import get_similarity_model
+
+    timed("imports", import_heavy_modules)
+    timed("taxonomy", get_taxonomy)
+    timed("similarity_model", get_similarity_model)
+    timed("sample_analysis", analyze_sample)
+
+    gc.collect()
+    gc.freeze()
+    _warmed = True
+    logger.info("Warm-up done: %s", stage_seconds)
+    return stage_seconds
+
+
+# === IMPORT-COST REPORT ===
+
+def import_costs(module="app"):
+    """
+    Import a module in a fresh interpreter with -X importtime
+    Returns [(name, self_us, cumulative_us, depth)] in import order
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    costs = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        costs.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return costs
+
+
+def _backend_modules():
+    return {name[:-3] for name in os.listdir(BACKEND_DIR) if name.endswith(".py")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import cost per module and warm-up time")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--top", type=int, default=20, help="Third-party modules to list")
+    args = parser.parse_args(argv)
+
+    costs = import_costs(args.module)
+    total = next((cumulative for name, _, cumulative, _ in costs if name == args.module), 0)
+    print(f"import {args.module}: {total / 1000:.1f} ms")
+
+    backend = _backend_modules()
+    print(f"\n{'backend module':32} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_us, cumulative_us, _ in costs:
+        if name in backend:
+            print(f"{name:32} {self_us / 1000:9.1f} {cumulative_us / 1000:14.1f}")
+
+    # Packages imported directly by backend code or Python's startup (not their submodules)
+    third_party = sorted(
+        (cost for cost in costs if "." not in cost[0] and cost[0] not in backend),
+        key=lambda cost: cost[2], reverse=True,
+    )
+    print(f"\n{'top-level package':32} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_us, cumulative_us, _ in third_party[:args.top]:
+        print(f"{name:32} {self_us / 1000:9.1f} {cumulative_us / 1000:14.1f}")
+
+    sys.path.insert(0, BACKEND_DIR)
+    started = time.perf_counter()
+    stage_seconds = warm_up()
+    print(f"\nwarm-up: {time.perf_counter() - started:.3f} s")
+    for stage, seconds in stage_seconds.items():
+        print(f"  {stage:30} {seconds * 1000:9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())